@@ -0,0 +1,192 @@
+"""
+Neural Network Lab  ─  headless training benchmark
+Trains the NeuralNetwork engines from nn_visualizer.py without opening a
+window and reports throughput, convergence time and peak memory.
+
+Each (engine × dataset × size × architecture) combination is trained from
+the same seed, so engines are compared on identical data and initial
+weights.  Results are printed as a table and written to JSON, so runs can
+be compared across engines and across commits.
+
+Run: python nn_benchmark.py                       # defaults below
+     python nn_benchmark.py --engines numpy --datasets spiral \\
+         --sizes 200 2000 --archs 2,16,16,1 --batch-size 32 --out run.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from nn_visualizer import DATASETS, ENGINES, HAS_NP, OPTIMIZERS
+
+if HAS_NP:
+    import numpy as np
+
+
+# ─────────────────────────────────────────────────────────
+# ONE BENCHMARK CASE
+# ─────────────────────────────────────────────────────────
+def run_case(engine: str, dataset: str, n: int, arch: list, *,
+             activation: str = 'tanh', lr: float = 0.5, optimizer: str = 'sgd',
+             batch_size: int = 1,
+             epochs: int = 200, target_acc: float = 0.95, seed: int = 0,
+             mem_epochs: int = 3) -> dict:
+    """
+    Train one configuration and return its measurements.
+    Timing and memory are separate runs: tracemalloc slows pure-Python code
+    far more than NumPy code and would skew the engine comparison.
+    """
+    data = DATASETS[dataset](n, seed)     # cached on disk per (name, n, seed)
+
+    # ── timed run ─────────────────────────────────────────
+    random.seed(seed)
+    net = ENGINES[engine](arch, activation, lr, optimizer)
+    t_target = ep_target = None
+    train_s  = 0.0
+    loss = acc = 0.0
+    start = time.perf_counter()
+    for ep in range(1, epochs + 1):
+        t0 = time.perf_counter()
+        loss, _ = net.train_epoch(data, batch_size)
+        train_s += time.perf_counter() - t0
+        # running accuracy from the training pass: no extra forward
+        acc = net.get_metrics(data, online=True)['accuracy']
+        if t_target is None and acc >= target_acc:
+            t_target, ep_target = time.perf_counter() - start, ep
+    total_s = time.perf_counter() - start
+    acc = net.get_metrics(data)['accuracy']
+
+    # ── memory run (short) ────────────────────────────────
+    random.seed(seed)
+    tracemalloc.start()
+    net = ENGINES[engine](arch, activation, lr, optimizer)
+    for _ in range(mem_epochs):
+        net.train_epoch(data, batch_size)
+        net.get_metrics(data, online=True)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'engine': engine, 'dataset': dataset, 'n': len(data),
+        'arch': list(arch), 'activation': activation, 'lr': lr,
+        'optimizer': optimizer,
+        'batch_size': batch_size, 'epochs': epochs, 'seed': seed,
+        'seconds': total_s,
+        'epochs_per_sec': epochs / total_s,
+        'samples_per_sec': epochs * len(data) / train_s,
+        'final_loss': loss,
+        'final_accuracy': acc,
+        'target_accuracy': target_acc,
+        'time_to_target': t_target,
+        'epochs_to_target': ep_target,
+        'peak_mem_kb': peak / 1024,
+    }
+
+
+# ─────────────────────────────────────────────────────────
+# REPORTING
+# ─────────────────────────────────────────────────────────
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results: list):
+    hdr = (f'{"engine":<7} {"dataset":<7} {"n":>6} {"arch":<14} '
+           f'{"ep/s":>9} {"samples/s":>11} {"acc":>6} '
+           f'{"t→target":>9} {"peak KB":>9}')
+    print(hdr)
+    print('─' * len(hdr))
+    for r in results:
+        arch = ','.join(str(s) for s in r['arch'])
+        tt   = (f'{r["time_to_target"]:.2f}s'
+                if r['time_to_target'] is not None else '—')
+        print(f'{r["engine"]:<7} {r["dataset"]:<7} {r["n"]:>6} {arch:<14} '
+              f'{r["epochs_per_sec"]:>9.1f} {r["samples_per_sec"]:>11,.0f} '
+              f'{r["final_accuracy"]*100:>5.1f}% {tt:>9} '
+              f'{r["peak_mem_kb"]:>9.1f}')
+
+
+# ─────────────────────────────────────────────────────────
+# ENTRY POINT
+# ─────────────────────────────────────────────────────────
+def _arch(text: str) -> list:
+    return [int(s) for s in text.split(',')]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split('\n\n')[0],
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument('--engines',  nargs='+', default=list(ENGINES),
+                    choices=list(ENGINES))
+    ap.add_argument('--datasets', nargs='+', default=list(DATASETS),
+                    choices=list(DATASETS))
+    ap.add_argument('--sizes',    nargs='+', type=int, default=[200, 1000])
+    ap.add_argument('--archs',    nargs='+', type=_arch,
+                    default=[[2, 4, 4, 1], [2, 16, 16, 1]],
+                    help='comma-separated layer sizes, e.g. 2,16,16,1')
+    ap.add_argument('--activation', default='tanh',
+                    choices=('sigmoid', 'relu', 'tanh'))
+    ap.add_argument('--lr',         type=float, default=0.5)
+    ap.add_argument('--optimizer',  default='sgd', choices=list(OPTIMIZERS))
+    ap.add_argument('--batch-size', type=int,   default=1,
+                    help='1 = SGD, N = mini-batch, 0 = full batch')
+    ap.add_argument('--epochs',     type=int,   default=100)
+    ap.add_argument('--target-acc', type=float, default=0.95)
+    ap.add_argument('--seed',       type=int,   default=0)
+    ap.add_argument('--out',        default='nn_benchmark.json',
+                    help='JSON output path ("-" prints it after the table)')
+    args = ap.parse_args(argv)
+
+    results = []
+    for dataset in args.datasets:
+        for n in args.sizes:
+            for arch in args.archs:
+                for engine in args.engines:
+                    r = run_case(engine, dataset, n, arch,
+                                 activation=args.activation, lr=args.lr,
+                                 optimizer=args.optimizer,
+                                 batch_size=args.batch_size,
+                                 epochs=args.epochs,
+                                 target_acc=args.target_acc, seed=args.seed)
+                    results.append(r)
+                    print(f'  {engine:<7} {dataset:<7} n={r["n"]:<6} '
+                          f'{",".join(map(str, arch)):<14} '
+                          f'{r["epochs_per_sec"]:8.1f} ep/s', file=sys.stderr)
+
+    print()
+    print_table(results)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit':    _git_commit(),
+            'python':    platform.python_version(),
+            'numpy':     np.__version__ if HAS_NP else None,
+            'platform':  platform.platform(),
+            'args':      vars(args),
+        },
+        'results': results,
+    }
+    if args.out == '-':
+        print()
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nWrote {len(results)} results to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
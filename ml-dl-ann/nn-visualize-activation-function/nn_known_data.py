@@ -14,8 +14,11 @@ Seed         : 42 (fully reproducible)
 Run: python nn_known_data.py
 """
 
+import itertools
 import math
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SEED  →  every run is identical
@@ -213,15 +216,79 @@ class NeuralNetwork:
     def predict(self, x: list) -> float:
         return self.forward(x)['activations'][-1][0]
 
+    def predict_batch(self, X: list) -> list:
+        """
+        ŷ for every input in X.  Propagates the whole batch one layer at a
+        time (a single pass) instead of calling forward() per sample; the
+        arithmetic is identical, so results match predict() exactly.
+        """
+        fn, _ = ACTS[self.activation]
+        last  = len(self.W) - 1
+        cur   = [list(x) for x in X]
+        for l, (Wl, Bl) in enumerate(zip(self.W, self.B)):
+            f   = sigmoid if l == last else fn
+            cur = [[f(Bl[j] + sum(w * a for w, a in zip(Wl[j], row)))
+                    for j in range(len(Wl))]
+                   for row in cur]
+        return [row[0] for row in cur]
+
     def binary_cross_entropy(self, y_hat: float, y: int) -> float:
         return -(y * math.log(y_hat + 1e-10) + (1 - y) * math.log(1 - y_hat + 1e-10))
 
     def accuracy(self, data: list) -> float:
-        correct = sum(1 for s in data
-                      if (self.predict(s['input']) >= 0.5) == bool(s['label']))
+        preds   = self.predict_batch([s['input'] for s in data])
+        correct = sum(1 for p, s in zip(preds, data)
+                      if (p >= 0.5) == bool(s['label']))
         return correct / len(data)
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# HYPERPARAMETER SWEEP  (one process per config, results in grid order)
+# ─────────────────────────────────────────────────────────────────────────────
+def _train_config(cfg: dict) -> dict:
+    """
+    Train one sweep config on XOR_DATA.  Runs in a worker process and
+    reseeds `random` from the config itself, so the result does not depend
+    on which worker picks it up or in what order.
+    """
+    random.seed(cfg['seed'])
+    net = NeuralNetwork(cfg['arch'], activation=cfg['activation'], lr=cfg['lr'])
+    try:
+        for _ in range(cfg['epochs']):
+            for s in XOR_DATA:                # fixed order (no shuffle)
+                net.backward(s['input'], s['label'])
+        preds = net.predict_batch([s['input'] for s in XOR_DATA])
+        loss  = sum(
+            net.binary_cross_entropy(p, s['label'])
+            for p, s in zip(preds, XOR_DATA)) / len(XOR_DATA)
+        acc  = net.accuracy(XOR_DATA)
+        if math.isnan(loss) or math.isinf(loss):
+            raise ValueError
+    except (ValueError, OverflowError):
+        loss, acc = float('nan'), 0.0
+    return dict(cfg, loss=loss, accuracy=acc)
+
+
+def run_sweep(activations=('sigmoid',), lrs=(0.5,), archs=([2, 3, 1],),
+              seeds=(42,), epochs: int = 500, workers: int = None) -> list:
+    """
+    Train every config in  activation × lr × architecture × seed  in a
+    process pool (default: one worker per CPU) and return one row per
+    config (grid order):
+      {'activation', 'lr', 'arch', 'seed', 'epochs', 'loss', 'accuracy'}
+    A diverged run reports loss = nan and accuracy = 0.
+    """
+    grid = [dict(activation=act, lr=lr, arch=list(arch), seed=seed, epochs=epochs)
+            for act, lr, arch, seed in itertools.product(activations, lrs, archs, seeds)]
+    if not grid:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(grid))
+    # a few chunks per worker: fewer round-trips, still balanced
+    chunksize = max(1, len(grid) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_train_config, grid, chunksize=chunksize))
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SECTION 1 — PROBLEM SETUP
 # ─────────────────────────────────────────────────────────────────────────────
@@ -439,7 +506,7 @@ def section_training(nn: NeuralNetwork, epochs: int = 500):
 
         loss = total_loss / len(XOR_DATA)
         acc  = nn.accuracy(XOR_DATA)
-        preds = [nn.predict(s['input']) for s in XOR_DATA]
+        preds = nn.predict_batch([s['input'] for s in XOR_DATA])
 
         if ep in show_epochs:
             pred_strs = [f'{p:.4f}' for p in preds]
@@ -521,18 +588,10 @@ def section_compare_activations():
   different activations and compare final accuracy and loss.
 """)
 
-    results = {}
-    for act in ('sigmoid', 'relu', 'tanh'):
-        random.seed(42)                          # identical init
-        net = NeuralNetwork([2, 4, 4, 1], activation=act, lr=0.5)
-        for _ in range(500):
-            for s in XOR_DATA:
-                net.backward(s['input'], s['label'])
-        loss = sum(
-            net.binary_cross_entropy(net.predict(s['input']), s['label'])
-            for s in XOR_DATA) / len(XOR_DATA)
-        acc  = net.accuracy(XOR_DATA)
-        results[act] = (loss, acc)
+    # identical init: every config is seeded with 42
+    rows = run_sweep(activations=('sigmoid', 'relu', 'tanh'), lrs=(0.5,),
+                     archs=([2, 4, 4, 1],), seeds=(42,), epochs=500)
+    results = {r['activation']: (r['loss'], r['accuracy']) for r in rows}
 
     h2('Results after 500 epochs (seed=42, lr=0.5, arch=[2,4,4,1])')
     print(f'\n  {"Activation":^12}  {"Loss":^12}  {"Accuracy":^12}')
@@ -568,23 +627,16 @@ def section_lr_sensitivity():
     print(f'\n  {"LR":^8}  {"Loss":^12}  {"Accuracy":^12}  {"Status":^20}')
     divider(width=58)
 
-    for lr in (0.01, 0.1, 0.5, 1.0, 2.0, 5.0):
-        random.seed(42)
-        net = NeuralNetwork([2, 3, 1], activation='sigmoid', lr=lr)
-        try:
-            for _ in range(1000):
-                for s in XOR_DATA:
-                    net.backward(s['input'], s['label'])
-            loss = sum(
-                net.binary_cross_entropy(net.predict(s['input']), s['label'])
-                for s in XOR_DATA) / len(XOR_DATA)
-            acc  = net.accuracy(XOR_DATA)
-            if math.isnan(loss) or math.isinf(loss):
-                raise ValueError
+    rows = run_sweep(activations=('sigmoid',),
+                     lrs=(0.01, 0.1, 0.5, 1.0, 2.0, 5.0),
+                     archs=([2, 3, 1],), seeds=(42,), epochs=1000)
+    for r in rows:
+        lr, loss, acc = r['lr'], r['loss'], r['accuracy']
+        if math.isnan(loss):
+            color, status = RED, 'DIVERGED'
+        else:
             color  = GREEN if acc == 1.0 else (YELLOW if acc >= 0.5 else RED)
             status = 'converged' if acc == 1.0 else ('partial' if acc >= 0.5 else 'stuck')
-        except (ValueError, OverflowError):
-            loss, acc, color, status = float('nan'), 0.0, RED, 'DIVERGED'
         print(f'  {lr:^8.3f}  {loss:^12.4f}  {color}{acc*100:^12.1f}%{RESET}  {color}{status:^20}{RESET}')
 
 
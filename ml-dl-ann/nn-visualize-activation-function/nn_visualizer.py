@@ -2,19 +2,35 @@
 Neural Network Lab  ─  Python / Tkinter
 Exact GUI equivalent of neural-network-lab.jsx
 
-Requires: pip install matplotlib
+Requires: pip install matplotlib   (numpy enables the array engine)
 Run:      python nn_visualizer.py
+          python nn_visualizer.py --resume   # continue from the last checkpoint
 """
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, ttk
+import argparse
+import copy
+import csv
 import math
+import os
+import pickle
 import random
 import threading
 import time
+from collections import deque
+from collections.abc import Sequence
+from contextlib import contextmanager
+
+try:
+    import numpy as np
+    HAS_NP = True
+except ImportError:
+    HAS_NP = False
 
 try:
     from matplotlib.figure import Figure
+    from matplotlib.colors import LinearSegmentedColormap
     from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
     HAS_MPL = True
 except ImportError:
@@ -37,6 +53,9 @@ RED      = '#f43f5e'
 GREEN    = '#34d399'
 YELLOW   = '#fbbf24'
 
+UI_FPS = 20    # default frame rate for UI refreshes while training
+CKPT_EVERY = 25   # epochs between automatic checkpoints while training
+
 MONO    = ('Courier New', 9)
 MONO_SM = ('Courier New', 8)
 MONO_LG = ('Courier New', 11)
@@ -88,33 +107,148 @@ ACTS = {
 }
 
 
+# Vectorised counterparts for the NumPy engine.  The derivatives take the
+# post-activation value, so sig_d / tanh_d work on arrays unchanged.
+def np_sigmoid(z):
+    lim = 80.0 if z.dtype == np.float32 else 500.0   # keep exp() finite
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -lim, lim)))
+
+def np_relu(z):     return np.maximum(z, 0.0)
+def np_relu_d(a):   return (a > 0).astype(a.dtype)
+def np_tanh(z):     return np.tanh(z)
+
+
+NP_ACTS = {
+    'sigmoid': (np_sigmoid, sig_d),
+    'relu':    (np_relu,    np_relu_d),
+    'tanh':    (np_tanh,    tanh_d),
+}
+
+
 # ─────────────────────────────────────────────────────────
 # DATASET GENERATORS
 # ─────────────────────────────────────────────────────────
-def gen_xor(n: int = 200):
+# Array generators: X is an n×2 float64 array, y an int8 label array, drawn
+# from a NumPy Generator seeded with `seed`.
+def xor_arrays(n: int = 200, seed=None):
+    rng = np.random.default_rng(seed)
+    X = (rng.random((n, 2)) > 0.5).astype(np.float64)
+    return X, (X[:, 0] != X[:, 1]).astype(np.int8)
+
+
+def circle_arrays(n: int = 200, seed=None):
+    rng = np.random.default_rng(seed)
+    X = rng.random((n, 2)) * 2 - 1
+    return X, ((X * X).sum(axis=1) < 0.5).astype(np.int8)
+
+
+def spiral_arrays(n: int = 200, seed=None):
+    rng  = np.random.default_rng(seed)
+    half = n // 2
+    i    = np.arange(half)
+    r    = i / half * 5
+    t    = 1.75 * i / half * 2 * math.pi + rng.random(half) * 0.3
+    arm  = np.column_stack((r * np.cos(t) / 5, r * np.sin(t) / 5))
+    X = np.empty((2 * half, 2))
+    X[0::2], X[1::2] = arm, -arm                 # interleaved, as gen_spiral
+    y = np.zeros(2 * half, np.int8)
+    y[1::2] = 1
+    return X, y
+
+
+ARRAY_DATASETS = {'xor': xor_arrays, 'circle': circle_arrays,
+                  'spiral': spiral_arrays}
+
+# Generated sets are cached here as <name>_n<n>_s<seed>.npz
+DATA_CACHE = os.environ.get('NN_LAB_CACHE',
+                            os.path.join(os.path.expanduser('~'), '.cache', 'nn-lab'))
+
+
+def load_arrays(name: str, n: int = 200, seed=None, cache_dir=DATA_CACHE):
+    """
+    (X, y) for dataset `name`.  With an explicit seed the set is read from /
+    written to `cache_dir` (None disables the cache).  seed=None draws a
+    fresh seed from `random`, so random.seed() keeps runs reproducible;
+    those one-off sets are not cached.
+    """
+    if seed is None:
+        return ARRAY_DATASETS[name](n, random.getrandbits(32))
+    if cache_dir is None:
+        return ARRAY_DATASETS[name](n, seed)
+    path = os.path.join(cache_dir, f'{name}_n{n}_s{seed}.npz')
+    try:
+        with np.load(path) as f:
+            return f['X'], f['y']
+    except (OSError, KeyError, ValueError):
+        pass
+    X, y = ARRAY_DATASETS[name](n, seed)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, X=X, y=y)
+        os.replace(tmp, path)      # atomic: readers never see a partial file
+    except OSError:
+        pass                       # read-only / full disk: just don't cache
+    return X, y
+
+
+class Dataset(Sequence):
+    """
+    Array-backed dataset.  Indexing yields the classic
+    {'input': [x1, x2], 'label': y} dicts on demand (slices give lists), so
+    list-of-dicts code keeps working without the dicts ever being stored.
+    The NumPy engines read X / y directly.
+    """
+    __slots__ = ('X', 'y')
+
+    def __init__(self, X, y):
+        self.X, self.y = X, y
+
+    def __len__(self):
+        return len(self.y)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self.y)))]
+        return {'input': self.X[i].tolist(), 'label': int(self.y[i])}
+
+
+# Dict API.  With NumPy these are thin views over load_arrays(); without it
+# they fall back to building the dicts point by point.
+def gen_xor(n: int = 200, seed=None):
+    if HAS_NP:
+        return Dataset(*load_arrays('xor', n, seed))
+    rnd = random if seed is None else random.Random(seed)
     out = []
     for _ in range(n):
-        x1 = float(random.random() > 0.5)
-        x2 = float(random.random() > 0.5)
+        x1 = float(rnd.random() > 0.5)
+        x2 = float(rnd.random() > 0.5)
         out.append({'input': [x1, x2], 'label': int(x1) ^ int(x2)})
     return out
 
 
-def gen_circle(n: int = 200):
+def gen_circle(n: int = 200, seed=None):
+    if HAS_NP:
+        return Dataset(*load_arrays('circle', n, seed))
+    rnd = random if seed is None else random.Random(seed)
     out = []
     for _ in range(n):
-        x = random.random() * 2 - 1
-        y = random.random() * 2 - 1
+        x = rnd.random() * 2 - 1
+        y = rnd.random() * 2 - 1
         out.append({'input': [x, y], 'label': 1 if x * x + y * y < 0.5 else 0})
     return out
 
 
-def gen_spiral(n: int = 200):
+def gen_spiral(n: int = 200, seed=None):
+    if HAS_NP:
+        return Dataset(*load_arrays('spiral', n, seed))
+    rnd = random if seed is None else random.Random(seed)
     out = []
     half = n // 2
     for i in range(half):
         r = i / half * 5
-        t = 1.75 * i / half * 2 * math.pi + random.random() * 0.3
+        t = 1.75 * i / half * 2 * math.pi + rnd.random() * 0.3
         out.append({'input': [r * math.cos(t) / 5,  r * math.sin(t) / 5],  'label': 0})
         out.append({'input': [-r * math.cos(t) / 5, -r * math.sin(t) / 5], 'label': 1})
     return out
@@ -122,17 +256,193 @@ def gen_spiral(n: int = 200):
 
 DATASETS = {'xor': gen_xor, 'circle': gen_circle, 'spiral': gen_spiral}
 
+# Input range (both axes) covered by the decision-boundary panel
+DOMAINS  = {'xor': (-0.25, 1.25), 'circle': (-1.1, 1.1), 'spiral': (-1.1, 1.1)}
+
+
+# ─────────────────────────────────────────────────────────
+# CHECKPOINTS
+# A checkpoint is one pickled dict (see App._checkpoint_blob).  Pickle is
+# binary, fast and handles lists, ndarrays and random.getstate() alike —
+# but only load checkpoints you wrote yourself.
+# ─────────────────────────────────────────────────────────
+CHECKPOINT = os.path.join(DATA_CACHE, 'checkpoint.pkl')
+CHECKPOINT_KEYS = ('engine', 'layers', 'activation', 'optimizer', 'batch_size',
+                   'dataset', 'data_seed', 'epoch', 'history', 'epoch_log',
+                   'rng', 'network')
+
+
+def write_checkpoint(path: str, blob: bytes):
+    """Write a pickled checkpoint atomically (temp file + rename)."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(blob)
+    os.replace(tmp, path)
+
+
+def read_checkpoint(path: str):
+    """The checkpoint dict stored at `path`, or None if there is none."""
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+# ─────────────────────────────────────────────────────────
+# PROFILING
+# forward / backward come from NeuralNetwork.phase_times, the rest are
+# timed around the calls in App.  UI phases measure the Python-side update
+# only; Tk paints later, from the event loop.
+# ─────────────────────────────────────────────────────────
+PHASES = ('forward', 'backward', 'metrics',
+          'canvas', 'chart', 'boundary', 'weights')
+
+
+class PhaseProfiler:
+    """
+    Rolling per-phase timings.  add() is two deque appends, cheap enough to
+    leave on and safe to call from the training thread.  means() averages
+    the last `window` samples of each phase; every sample is also logged
+    (the newest `max_log`) for dump_csv().
+    """
+
+    def __init__(self, window: int = 30, max_log: int = 100_000):
+        self._t0  = time.perf_counter()
+        self._win = {p: deque(maxlen=window) for p in PHASES}
+        self._log = deque(maxlen=max_log)    # (t_s, epoch, phase, ms)
+
+    def add(self, phase: str, seconds: float, epoch=None):
+        ms = seconds * 1e3
+        self._win[phase].append(ms)
+        self._log.append((time.perf_counter() - self._t0, epoch, phase, ms))
+
+    @contextmanager
+    def timed(self, phase: str, epoch=None):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - t0, epoch)
+
+    def means(self) -> dict:
+        """Phase → mean ms over the window (None before the first sample)."""
+        out = {}
+        for p, w in self._win.items():
+            w = list(w)
+            out[p] = sum(w) / len(w) if w else None
+        return out
+
+    def dump_csv(self, path: str) -> int:
+        """Write the sample log as CSV; returns the number of rows."""
+        rows = list(self._log)
+        with open(path, 'w', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(('t_s', 'epoch', 'phase', 'ms'))
+            w.writerows((f'{t:.6f}', '' if ep is None else ep, p, f'{ms:.4f}')
+                        for t, ep, p, ms in rows)
+        return len(rows)
+
+
+# ─────────────────────────────────────────────────────────
+# OPTIMIZERS
+# State is keyed per parameter: ('W', l) / ('B', l) tensors in the NumPy
+# engine, ('W', l, j, k) / ('B', l, j) scalars in the list engine.  The
+# update formulas are plain arithmetic, so they work on floats and ndarrays.
+# ─────────────────────────────────────────────────────────
+class Optimizer:
+    name = ''
+
+    def __init__(self):
+        self.t     = 0     # number of updates so far
+        self.state = {}    # parameter key → optimizer state
+
+    def tick(self):
+        """Call once per weight update, before the delta() calls."""
+        self.t += 1
+
+    def delta(self, key, g, lr):
+        """Amount to subtract from parameter `key` whose gradient is g."""
+        raise NotImplementedError
+
+
+class SGD(Optimizer):
+    """p ← p − lr·g"""
+    name = 'sgd'
+
+    def delta(self, key, g, lr):
+        return lr * g
+
+
+class Momentum(Optimizer):
+    """v ← μ·v + g,   p ← p − lr·v"""
+    name = 'momentum'
+
+    def __init__(self, mu=0.9):
+        super().__init__()
+        self.mu = mu
+
+    def delta(self, key, g, lr):
+        v = self.mu * self.state.get(key, 0.0) + g
+        self.state[key] = v
+        return lr * v
+
+
+class RMSProp(Optimizer):
+    """s ← ρ·s + (1−ρ)·g²,   p ← p − lr·g / (√s + ε)"""
+    name = 'rmsprop'
+
+    def __init__(self, rho=0.9, eps=1e-8):
+        super().__init__()
+        self.rho, self.eps = rho, eps
+
+    def delta(self, key, g, lr):
+        sq = self.rho * self.state.get(key, 0.0) + (1 - self.rho) * g * g
+        self.state[key] = sq
+        return lr * g / (sq ** 0.5 + self.eps)
+
+
+class Adam(Optimizer):
+    """m ← β₁m + (1−β₁)g,   v ← β₂v + (1−β₂)g²,   p ← p − lr·m̂ / (√v̂ + ε)"""
+    name = 'adam'
+
+    def __init__(self, b1=0.9, b2=0.999, eps=1e-8):
+        super().__init__()
+        self.b1, self.b2, self.eps = b1, b2, eps
+
+    def delta(self, key, g, lr):
+        m, v = self.state.get(key, (0.0, 0.0))
+        m = self.b1 * m + (1 - self.b1) * g
+        v = self.b2 * v + (1 - self.b2) * g * g
+        self.state[key] = (m, v)
+        m_hat = m / (1 - self.b1 ** self.t)
+        v_hat = v / (1 - self.b2 ** self.t)
+        return lr * m_hat / (v_hat ** 0.5 + self.eps)
+
+
+OPTIMIZERS = {o.name: o for o in (SGD, Momentum, RMSProp, Adam)}
+
 
 # ─────────────────────────────────────────────────────────
 # NEURAL NETWORK   (exact port of the JS class)
 # ─────────────────────────────────────────────────────────
 class NeuralNetwork:
-    def __init__(self, sizes, activation='sigmoid', lr=0.5):
+    __slots__ = ('sizes', 'activation', 'lr', 'optimizer', 'W', 'B',
+                 'phase_times', '_version', '_eval_cache', '_train_outputs')
+
+    def __init__(self, sizes, activation='sigmoid', lr=0.5, optimizer='sgd'):
         self.sizes      = list(sizes)
         self.activation = activation
         self.lr         = lr
+        self.optimizer  = OPTIMIZERS[optimizer]()
         self.W: list    = []   # weights[layer][j][k]
         self.B: list    = []   # biases[layer][j]
+        self._version   = 0    # bumped on every weight update
+        self._eval_cache = None  # (data, version, outputs) of the last eval
+        self._train_outputs = None  # (data, outputs, labels) of last epoch
+        # seconds spent in forward / backward during the last train_epoch
+        self.phase_times = {'forward': 0.0, 'backward': 0.0}
         self._init_weights()
 
     def _init_weights(self):
@@ -156,9 +466,8 @@ class NeuralNetwork:
             Z.append(pre); A.append(nxt); cur = nxt
         return {'activations': A, 'pre_activations': Z}
 
-    def backward(self, x, y):
-        fwd  = self.forward(x)
-        A    = fwd['activations']
+    def _deltas(self, A, y):
+        """Error signal per layer for activations `A` and label `y`."""
         _, d = ACTS[self.activation]
         nL   = len(self.W)
         delta = [None] * nL
@@ -175,44 +484,173 @@ class NeuralNetwork:
                     for k in range(self.sizes[l + 2])) * d(A[l+1][j])
                 for j in range(self.sizes[l + 1])
             ]
-        # Weight update + gradient collection
-        G = []
-        for l in range(nL):
-            lg = []
+        return delta
+
+    def _apply(self, G, dB):
+        """Optimizer step on every weight and bias given G and dB."""
+        opt, lr = self.optimizer, self.lr
+        opt.tick()
+        for l in range(len(self.W)):
             for j in range(len(self.W[l])):
-                ng = []
                 for k in range(len(self.W[l][j])):
-                    g = delta[l][j] * A[l][k]
-                    ng.append(g)
-                    self.W[l][j][k] -= self.lr * g
-                lg.append(ng)
-                self.B[l][j] -= self.lr * delta[l][j]
-            G.append(lg)
+                    self.W[l][j][k] -= opt.delta(('W', l, j, k), G[l][j][k], lr)
+                self.B[l][j] -= opt.delta(('B', l, j), dB[l][j], lr)
+        self._version += 1
+
+    def backward(self, x, y, A=None):
+        """
+        Backprop + weight update for one sample.  Pass the activations A
+        of an earlier forward(x) to skip recomputing them.
+        """
+        if A is None:
+            A = self.forward(x)['activations']
+        delta = self._deltas(A, y)
+        # Gradient collection + weight update
+        G = [[[dj * ak for ak in A[l]] for dj in delta[l]]
+             for l in range(len(self.W))]
+        self._apply(G, delta)
 
         return {'activations': A, 'deltas': delta, 'gradients': G}
 
-    def train_epoch(self, data):
-        loss, last = 0.0, None
+    def train_step(self, x, y, A=None):
+        """
+        Fused per-sample step: one forward (skipped when A is given) and
+        one backward.  Returns the backward() result plus the pre-update
+        `output` ŷ and its BCE `loss`.
+        """
+        t0 = time.perf_counter()
+        if A is None:
+            A = self.forward(x)['activations']
+        t1 = time.perf_counter()
+        r = self.backward(x, y, A)
+        o = r['activations'][-1][0]
+        r['output'], r['loss'] = o, self._bce(o, y)
+        pt = self.phase_times
+        pt['forward']  += t1 - t0
+        pt['backward'] += time.perf_counter() - t1
+        return r
+
+    @staticmethod
+    def _bce(o, y) -> float:
+        return -(y * math.log(o + 1e-10) + (1 - y) * math.log(1 - o + 1e-10))
+
+    def backward_batch(self, X, Y, A=None):
+        """
+        One averaged update over the samples X (inputs) / Y (labels).
+        Pass A, the activations of an earlier forward(x) for each sample,
+        to skip recomputing them.
+        Returns batch-mean activations, deltas and gradients (same shapes
+        as `backward`), plus per-sample `outputs` and the summed BCE `loss`.
+        """
+        n     = len(X)
+        G     = [[[0.0] * len(r) for r in Wl] for Wl in self.W]
+        dB    = [[0.0] * len(Bl) for Bl in self.B]
+        A_sum = [[0.0] * sz for sz in self.sizes]
+        outs, loss, t_fwd = [], 0.0, 0.0
+        t0 = time.perf_counter()
+        for i, (x, y) in enumerate(zip(X, Y)):
+            t1    = time.perf_counter()
+            As    = self.forward(x)['activations'] if A is None else A[i]
+            t_fwd += time.perf_counter() - t1
+            delta = self._deltas(As, y)
+            for l, dl in enumerate(delta):
+                for j, dj in enumerate(dl):
+                    dB[l][j] += dj / n
+                    for k, ak in enumerate(As[l]):
+                        G[l][j][k] += dj * ak / n
+            for l, al in enumerate(As):
+                for j, a in enumerate(al):
+                    A_sum[l][j] += a
+            o = As[-1][0]
+            outs.append(o)
+            loss += self._bce(o, y)
+        self._apply(G, dB)
+        self.phase_times['forward']  += t_fwd
+        self.phase_times['backward'] += time.perf_counter() - t0 - t_fwd
+
+        return {'activations': [[a / n for a in al] for al in A_sum],
+                'deltas': dB, 'gradients': G, 'outputs': outs, 'loss': loss}
+
+    def train_epoch(self, data, batch_size=1):
+        """
+        One pass over `data` in shuffled order.
+        batch_size: 1 → per-sample SGD, N → mini-batches of N,
+                    0 → full batch (one averaged update per epoch).
+        """
+        loss, last, outs = 0.0, None, []
+        self.phase_times = {'forward': 0.0, 'backward': 0.0}
         shuffled = data[:]
         random.shuffle(shuffled)
-        for s in shuffled:
-            last = self.backward(s['input'], s['label'])
-            o    = last['activations'][-1][0]
-            loss += -(s['label'] * math.log(o + 1e-10) +
-                      (1 - s['label']) * math.log(1 - o + 1e-10))
+        if batch_size == 1:
+            for s in shuffled:
+                last = self.train_step(s['input'], s['label'])
+                loss += last['loss']
+                outs.append(last['output'])
+        else:
+            bs = batch_size or len(shuffled)
+            for i in range(0, len(shuffled), bs):
+                batch = shuffled[i:i + bs]
+                last  = self.backward_batch([s['input'] for s in batch],
+                                            [s['label'] for s in batch])
+                loss += last['loss']
+                outs.extend(last['outputs'])
+        self._train_outputs = (data, outs, [s['label'] for s in shuffled])
         return loss / len(data), last
 
     def predict(self, x) -> float:
         return self.forward(x)['activations'][-1][0]
 
-    def get_metrics(self, data) -> dict:
+    def predict_batch(self, X):
+        """Output probability for every input in X."""
+        return [self.forward(x)['activations'][-1][0] for x in X]
+
+    def _eval_outputs(self, data, cached=False):
+        """
+        predict_batch over `data`.  With cached=True the outputs of the
+        previous evaluation are reused as long as it was on the same data
+        object and no weight update has happened since.
+        """
+        c = self._eval_cache
+        if cached and c and c[0] is data and c[1] == self._version:
+            return c[2]
+        out = self.predict_batch(self._inputs(data))
+        self._eval_cache = (data, self._version, out)
+        return out
+
+    def _inputs(self, data):
+        return [s['input'] for s in data]
+
+    def _labels(self, data):
+        return [s['label'] for s in data]
+
+    def get_metrics(self, data, cached=False, online=False) -> dict:
+        """
+        Classification metrics on `data`.
+        cached=True → reuse the last evaluation while the weights are unchanged.
+        online=True → no extra pass: score the outputs the last train_epoch
+                      on `data` produced, each taken just before that
+                      sample's own update (running training metrics).
+        """
+        t = self._train_outputs
+        if online and t and t[0] is data:
+            outs, labels = t[1], t[2]
+        else:
+            outs, labels = self._eval_outputs(data, cached), self._labels(data)
+        return self._metrics(*self._confusion(outs, labels))
+
+    @staticmethod
+    def _confusion(outs, labels):
         tp = fp = fn = tn = 0
-        for s in data:
-            p, t = (1 if self.predict(s['input']) >= 0.5 else 0), s['label']
+        for o, t in zip(outs, labels):
+            p = 1 if o >= 0.5 else 0
             if   p == 1 and t == 1: tp += 1
             elif p == 1 and t == 0: fp += 1
             elif p == 0 and t == 1: fn += 1
             else:                   tn += 1
+        return tp, fp, fn, tn
+
+    @staticmethod
+    def _metrics(tp, fp, fn, tn) -> dict:
         n   = tp + fp + fn + tn
         acc = (tp + tn) / n if n else 0.0
         pr  = tp / (tp + fp) if (tp + fp) else 0.0
@@ -222,17 +660,312 @@ class NeuralNetwork:
         return dict(accuracy=acc, precision=pr, recall=rc, f1=f1,
                     specificity=sp, tp=tp, fp=fp, fn=fn, tn=tn)
 
+    def get_state(self) -> dict:
+        """
+        Parameters and optimizer state.  Holds references, not copies:
+        pickle it before training continues.
+        """
+        opt = self.optimizer
+        return {'sizes': self.sizes, 'activation': self.activation,
+                'lr': self.lr, 'W': self.W, 'B': self.B,
+                'optimizer': opt.name, 'opt_t': opt.t, 'opt_state': opt.state}
+
+    def set_state(self, state: dict):
+        """Restore get_state() output from a network of the same shape."""
+        if list(state['sizes']) != self.sizes:
+            raise ValueError(f'checkpoint is for {state["sizes"]}, '
+                             f'network is {self.sizes}')
+        self._set_params(state['W'], state['B'])
+        self.lr = state['lr']
+        self.optimizer = OPTIMIZERS[state['optimizer']]()
+        self.optimizer.t, self.optimizer.state = state['opt_t'], state['opt_state']
+        self._version += 1
+
+    def _set_params(self, W, B):
+        self.W = [[[float(v) for v in r] for r in Wl] for Wl in W]
+        self.B = [[float(v) for v in Bl] for Bl in B]
+
     @property
     def total_params(self) -> int:
         return (sum(len(r) for L in self.W for r in L) +
                 sum(len(b) for b in self.B))
 
 
+class NumpyNeuralNetwork(NeuralNetwork):
+    """
+    Array-backed engine with the same interface as NeuralNetwork.
+    W[l] is an (out × in) ndarray and B[l] a vector, so each layer is one
+    matmul plus a vectorised activation instead of a loop per neuron.
+    """
+
+    __slots__ = ('dtype', '_data_arrays')
+
+    def __init__(self, sizes, activation='sigmoid', lr=0.5, optimizer='sgd',
+                 dtype='float64'):
+        self.dtype        = np.dtype(dtype)
+        self._data_arrays = None   # (data, X, y) of the last dataset seen
+        super().__init__(sizes, activation, lr, optimizer)
+
+    def _init_weights(self):
+        # Draw from `random` exactly like the list engine, so a given seed
+        # gives identical starting weights in both engines.
+        super()._init_weights()
+        self.W = [np.array(Wl, dtype=self.dtype) for Wl in self.W]
+        self.B = [np.array(Bl, dtype=self.dtype) for Bl in self.B]
+
+    def forward(self, x):
+        fn, _ = NP_ACTS[self.activation]
+        cur  = np.asarray(x, dtype=self.dtype)
+        A, Z = [cur], [cur]
+        last = len(self.W) - 1
+        for l, (Wl, Bl) in enumerate(zip(self.W, self.B)):
+            z   = cur @ Wl.T + Bl
+            cur = np_sigmoid(z) if l == last else fn(z)
+            Z.append(z); A.append(cur)
+        return {'activations': A, 'pre_activations': Z}
+
+    def _deltas(self, A, y):
+        # Works for a single sample (vectors) and a batch (rows) alike.
+        _, d = NP_ACTS[self.activation]
+        nL   = len(self.W)
+        delta = [None] * nL
+
+        # Output layer delta
+        delta[nL - 1] = (A[nL] - y) * sig_d(A[nL])
+        # Hidden layer deltas (backprop) — uses pre-update weights
+        for l in range(nL - 2, -1, -1):
+            delta[l] = (delta[l + 1] @ self.W[l + 1]) * d(A[l + 1])
+        return delta
+
+    def _apply(self, G, dB):
+        opt, lr = self.optimizer, self.lr
+        opt.tick()
+        for l in range(len(self.W)):
+            self.W[l] -= opt.delta(('W', l), G[l], lr)
+            self.B[l] -= opt.delta(('B', l), dB[l], lr)
+        self._version += 1
+
+    def _sample_grads(self, delta, A):
+        return [np.outer(dl, al) for dl, al in zip(delta, A)], delta
+
+    def _batch_grads(self, delta, A):
+        n = len(A[0])
+        return ([dl.T @ al / n for dl, al in zip(delta, A)],
+                [dl.mean(axis=0) for dl in delta])
+
+    def backward(self, x, y, A=None):
+        if A is None:
+            A = self.forward(x)['activations']
+        delta = self._deltas(A, y)
+        # Gradient collection + weight update
+        G, dB = self._sample_grads(delta, A)
+        self._apply(G, dB)
+
+        return {'activations': A, 'deltas': delta, 'gradients': G}
+
+    def backward_batch(self, X, Y, A=None):
+        Y  = np.asarray(Y, dtype=self.dtype)[:, None]
+        t0 = time.perf_counter()
+        if A is None:
+            A = self.forward(np.asarray(X, dtype=self.dtype))['activations']
+        t1 = time.perf_counter()
+        delta = self._deltas(A, Y)
+        G, dB = self._batch_grads(delta, A)
+        self._apply(G, dB)
+        self.phase_times['forward']  += t1 - t0
+        self.phase_times['backward'] += time.perf_counter() - t1
+
+        o, y = A[-1][:, 0], Y[:, 0]
+        loss = -(y * np.log(o + 1e-10) + (1 - y) * np.log(1 - o + 1e-10)).sum()
+        return {'activations': [a.mean(axis=0) for a in A],
+                'deltas': dB, 'gradients': G, 'outputs': o, 'loss': float(loss)}
+
+    def _set_params(self, W, B):
+        # In place: the compact engine's W / B are views into one buffer
+        for dst, src in zip(self.W + self.B, list(W) + list(B)):
+            dst[...] = np.asarray(src, dtype=self.dtype)
+
+    def _arrays(self, data):
+        """(X, y) ndarrays for a list-of-dicts dataset, kept for the last
+        dataset seen so repeated evaluations skip the conversion."""
+        if self._data_arrays is None or self._data_arrays[0] is not data:
+            if isinstance(data, Dataset):
+                X = data.X.astype(self.dtype)
+                y = data.y.astype(bool)
+            else:
+                X = np.array([s['input'] for s in data],
+                             dtype=self.dtype).reshape(len(data), -1)
+                y = np.array([s['label'] for s in data], dtype=bool)
+            self._data_arrays = (data, X, y)
+        return self._data_arrays[1], self._data_arrays[2]
+
+    def _inputs(self, data):
+        return self._arrays(data)[0]
+
+    def _labels(self, data):
+        return self._arrays(data)[1]
+
+    def train_epoch(self, data, batch_size=1):
+        # Same shuffle as the list engine (random.shuffle of n positions),
+        # applied to the cached arrays instead of the list of dicts.
+        X, y  = self._arrays(data)
+        order = list(range(len(y)))
+        random.shuffle(order)
+        X, y  = X[order], y[order]
+        Y     = y.astype(self.dtype)
+        loss, last = 0.0, None
+        self.phase_times = {'forward': 0.0, 'backward': 0.0}
+        if batch_size == 1:
+            outs = np.empty(len(y), self.dtype)
+            for i in range(len(y)):
+                last = self.train_step(X[i], Y[i])
+                loss += last['loss']
+                outs[i] = last['output']
+        else:
+            bs, outs = batch_size or len(y), []
+            for i in range(0, len(y), bs):
+                last  = self.backward_batch(X[i:i + bs], Y[i:i + bs])
+                loss += last['loss']
+                outs.append(last['outputs'])
+            outs = np.concatenate(outs)
+        self._train_outputs = (data, outs, y)
+        return float(loss) / len(data), last
+
+    def predict_batch(self, X):
+        """Output probability for every row of X in one batched forward."""
+        X = np.asarray(X, dtype=self.dtype)
+        return self.forward(X)['activations'][-1][:, 0]
+
+    @staticmethod
+    def _confusion(outs, labels):
+        p  = np.asarray(outs) >= 0.5
+        t  = np.asarray(labels, dtype=bool)
+        tp = int(np.count_nonzero(p & t))
+        fp = int(np.count_nonzero(p & ~t))
+        fn = int(np.count_nonzero(~p & t))
+        return tp, fp, fn, len(t) - tp - fp - fn
+
+
+class CompactNeuralNetwork(NumpyNeuralNetwork):
+    """
+    NumPy engine with every weight and bias in one contiguous buffer
+    (float32 by default); W[l] / B[l] are views into it.  Gradients share
+    a second buffer with the same layout, and the single-sample
+    activation / delta vectors are preallocated, so per-sample steps do
+    not allocate per-layer arrays.  The arrays returned by forward() and
+    backward() are those reused buffers — copy them to keep them.
+    """
+
+    __slots__ = ('_params', '_grads', '_step', '_G', '_dB', '_A', '_Z', '_D')
+
+    def __init__(self, sizes, activation='sigmoid', lr=0.5, optimizer='sgd',
+                 dtype='float32'):
+        super().__init__(sizes, activation, lr, optimizer, dtype)
+
+    def _views(self, buf):
+        """Per-layer (out × in) weight and bias views into a flat buffer."""
+        W, B, off = [], [], 0
+        for fi, fo in zip(self.sizes, self.sizes[1:]):
+            W.append(buf[off:off + fo * fi].reshape(fo, fi)); off += fo * fi
+            B.append(buf[off:off + fo]);                      off += fo
+        return W, B
+
+    def _init_weights(self):
+        super()._init_weights()
+        n = sum(fo * fi + fo for fi, fo in zip(self.sizes, self.sizes[1:]))
+        self._params = np.empty(n, self.dtype)
+        W, B = self._views(self._params)
+        for dst, src in zip(W + B, self.W + self.B):
+            dst[...] = src
+        self.W, self.B = W, B
+
+        self._grads = np.zeros(n, self.dtype)
+        self._step  = np.empty(n, self.dtype)
+        self._G, self._dB = self._views(self._grads)
+        self._A = [np.empty(sz, self.dtype) for sz in self.sizes]
+        self._Z = [self._A[0]] + [np.empty(sz, self.dtype) for sz in self.sizes[1:]]
+        self._D = [np.empty(sz, self.dtype) for sz in self.sizes[1:]]
+
+    def _act_into(self, z, out, act):
+        if act == 'sigmoid':
+            lim = 80.0 if self.dtype == np.float32 else 500.0
+            np.clip(z, -lim, lim, out=out)
+            np.negative(out, out=out)
+            np.exp(out, out=out)
+            out += 1.0
+            np.reciprocal(out, out=out)
+        elif act == 'relu':
+            np.maximum(z, 0.0, out=out)
+        else:
+            np.tanh(z, out=out)
+
+    def forward(self, x):
+        cur = np.asarray(x, dtype=self.dtype)
+        if cur.ndim > 1:                   # batch: row count varies, allocate
+            return super().forward(cur)
+        A, Z = self._A, self._Z
+        A[0][...] = cur
+        last = len(self.W) - 1
+        for l, (Wl, Bl) in enumerate(zip(self.W, self.B)):
+            np.matmul(Wl, A[l], out=Z[l + 1])
+            Z[l + 1] += Bl
+            self._act_into(Z[l + 1], A[l + 1],
+                           'sigmoid' if l == last else self.activation)
+        return {'activations': A, 'pre_activations': Z}
+
+    def _deltas(self, A, y):
+        if A[0].ndim > 1:
+            return super()._deltas(A, y)
+        _, d = NP_ACTS[self.activation]
+        D, nL = self._D, len(self.W)
+        out = A[nL]
+        np.subtract(out, y, out=D[-1])
+        D[-1] *= sig_d(out)
+        for l in range(nL - 2, -1, -1):
+            np.matmul(D[l + 1], self.W[l + 1], out=D[l])
+            D[l] *= d(A[l + 1])
+        return D
+
+    def _sample_grads(self, delta, A):
+        for dl, al, Gl, dBl in zip(delta, A, self._G, self._dB):
+            np.outer(dl, al, out=Gl)
+            dBl[...] = dl
+        return self._G, self._dB
+
+    def _batch_grads(self, delta, A):
+        n = len(A[0])
+        for dl, al, Gl, dBl in zip(delta, A, self._G, self._dB):
+            np.matmul(dl.T, al, out=Gl)
+            Gl /= n
+            np.mean(dl, axis=0, out=dBl)
+        return self._G, self._dB
+
+    def _apply(self, G, dB):
+        # G / dB are the views into _grads, so plain SGD is a single fused
+        # update over the flat buffers; other optimizers go per tensor.
+        if type(self.optimizer) is not SGD:
+            return super()._apply(G, dB)
+        self.optimizer.tick()
+        np.multiply(self._grads, self.lr, out=self._step)
+        self._params -= self._step
+        self._version += 1
+
+
+ENGINES = {'python': NeuralNetwork}
+if HAS_NP:
+    ENGINES['numpy']   = NumpyNeuralNetwork
+    ENGINES['compact'] = CompactNeuralNetwork
+
+
 # ─────────────────────────────────────────────────────────
 # NETWORK CANVAS  (port of NetworkGraph SVG component)
 # ─────────────────────────────────────────────────────────
 class NetworkCanvas(tk.Canvas):
-    """Draws the live neural network graph on a dark canvas."""
+    """
+    Draws the live neural network graph on a dark canvas.
+    Canvas items are created once per topology / window size; every other
+    redraw only pushes changed colours, widths and labels via itemconfigure.
+    """
 
     PAD_X = 55
     PAD_Y = 28
@@ -242,6 +975,10 @@ class NetworkCanvas(tk.Canvas):
         self._network = None
         self._last    = None
         self._phase   = None
+        self._layout  = None      # (sizes, W, H) the items were built for
+        self._lines: list = []    # (li, j, k, base, fwd, bwd) line ids
+        self._nodes: list = []    # (li, ni, halo, body, label) item ids
+        self._shown: dict = {}    # item id → last itemconfigure options
         self.bind('<Configure>', lambda _: self.redraw())
 
     def update_state(self, network, last_result, phase):
@@ -261,24 +998,37 @@ class NetworkCanvas(tk.Canvas):
         else:
             return _hex(100 + b * 155, 60 + b * 120, 200 + b * 55)
 
+    def _set(self, item, **opts):
+        """itemconfigure, skipped when the options match the last call."""
+        if self._shown.get(item) != opts:
+            self._shown[item] = opts
+            self.itemconfigure(item, **opts)
+
     # ── main draw ──────────────────────────────────────────
     def redraw(self):
-        self.delete('all')
         if not self._network:
+            self.delete('all')
+            self._layout = None
             return
         W  = self.winfo_width()
         H  = self.winfo_height()
         if W < 20 or H < 20:
             return
-
-        nn    = self._network
-        sizes = nn.sizes
-        last  = self._last
-        phase = self._phase
-        nL    = len(sizes)
-        if nL < 2:
+        sizes = self._network.sizes
+        if len(sizes) < 2:
             return
 
+        if self._layout != (tuple(sizes), W, H):
+            self._build(sizes, W, H)
+        self._update()
+
+    # ── one-off item creation (topology or size changed) ───
+    def _build(self, sizes, W, H):
+        self.delete('all')
+        self._layout = (tuple(sizes), W, H)
+        self._lines, self._nodes, self._shown = [], [], {}
+        nL = len(sizes)
+
         px, py = self.PAD_X, self.PAD_Y
         sp = (W - 2 * px) / (nL - 1)
 
@@ -289,71 +1039,43 @@ class NetworkCanvas(tk.Canvas):
             vsp   = (H - 2 * py) / (sz + 1)
             pos.append([(x, py + vsp * (ni + 1)) for ni in range(sz)])
 
-        acts  = last['activations'] if last else None
-        grads = last.get('gradients') if last else None
-        is_fwd = phase == 'forward'
-        is_bwd = phase == 'backward'
-
-        # ── Draw connections ────────────────────────────────
-        for li, Wl in enumerate(nn.W):
-            for j, row in enumerate(Wl):
-                for k, w in enumerate(row):
+        # ── Connections (base line + hidden phase overlays) ─
+        for li in range(nL - 1):
+            for j in range(sizes[li + 1]):
+                for k in range(sizes[li]):
                     x1, y1 = pos[li][k]
                     x2, y2 = pos[li + 1][j]
-                    abs_w   = abs(w)
-                    opacity = min(0.15 + abs_w * 0.6, 0.9)
-                    sw      = max(1, int(min(0.5 + abs_w * 2.5, 4)))
-                    fg      = CYAN if w > 0 else ORANGE
-                    color   = blend(fg, opacity)
-
-                    self.create_line(x1, y1, x2, y2,
-                                     fill=color, width=sw,
-                                     capstyle=tk.ROUND)
-
-                    if is_fwd:
-                        self.create_line(x1, y1, x2, y2,
-                                         fill=blend(CYAN, 0.35),
-                                         width=sw + 1,
-                                         dash=(4, 12),
-                                         capstyle=tk.ROUND)
-                    elif is_bwd and grads and li < len(grads):
-                        gv = 0.0
-                        if j < len(grads[li]) and k < len(grads[li][j]):
-                            gv = abs(grads[li][j][k])
-                        if gv > 0.001:
-                            bw = max(1, int(min(1 + gv * 10, 5)))
-                            self.create_line(x2, y2, x1, y1,
-                                             fill=blend(ORANGE, 0.45),
-                                             width=bw,
-                                             dash=(3, 10),
-                                             capstyle=tk.ROUND)
-
-        # ── Draw neurons ────────────────────────────────────
+                    base = self.create_line(x1, y1, x2, y2,
+                                            capstyle=tk.ROUND)
+                    fwd  = self.create_line(x1, y1, x2, y2,
+                                            fill=blend(CYAN, 0.35),
+                                            dash=(4, 12),
+                                            capstyle=tk.ROUND,
+                                            state=tk.HIDDEN)
+                    bwd  = self.create_line(x2, y2, x1, y1,
+                                            fill=blend(ORANGE, 0.45),
+                                            dash=(3, 10),
+                                            capstyle=tk.ROUND,
+                                            state=tk.HIDDEN)
+                    self._lines.append((li, j, k, base, fwd, bwd))
+
+        # ── Neurons ─────────────────────────────────────────
         for li, layer_pos in enumerate(pos):
             for ni, (x, y) in enumerate(layer_pos):
-                act    = (acts[li][ni]
-                          if acts and li < len(acts) and ni < len(acts[li])
-                          else 0.5)
                 is_in  = (li == 0)
                 is_out = (li == nL - 1)
                 r      = 14 if is_out else (12 if is_in else 10)
-                fill   = self._neuron_color(act, is_in, is_out)
-
                 # glow halo (simulates SVG filter="url(#glow)")
-                if is_fwd or is_bwd:
-                    halo = blend(fill, 0.18)
-                    self.create_oval(x - r - 4, y - r - 4,
-                                     x + r + 4, y + r + 4,
-                                     fill=halo, outline='')
-
-                self.create_oval(x - r, y - r, x + r, y + r,
-                                 fill=fill, outline=BORDER, width=2)
-
-                self.create_text(x, y + 1,
-                                 text=f'{act:.2f}',
-                                 fill='#e2e8f0',
-                                 font=('Courier New', 6, 'bold'),
-                                 anchor='center')
+                halo  = self.create_oval(x - r - 4, y - r - 4,
+                                         x + r + 4, y + r + 4,
+                                         outline='', state=tk.HIDDEN)
+                body  = self.create_oval(x - r, y - r, x + r, y + r,
+                                         outline=BORDER, width=2)
+                label = self.create_text(x, y + 1,
+                                         fill='#e2e8f0',
+                                         font=('Courier New', 6, 'bold'),
+                                         anchor='center')
+                self._nodes.append((li, ni, halo, body, label))
 
         # ── Layer labels ────────────────────────────────────
         for li, layer_pos in enumerate(pos):
@@ -365,12 +1087,64 @@ class NetworkCanvas(tk.Canvas):
                              fill=MUTED, font=('Courier New', 8),
                              anchor='s')
 
+    # ── per-frame state push ───────────────────────────────
+    def _update(self):
+        nn     = self._network
+        nL     = len(nn.sizes)
+        last   = self._last
+        acts   = last['activations'] if last else None
+        grads  = last.get('gradients') if last else None
+        is_fwd = self._phase == 'forward'
+        is_bwd = self._phase == 'backward'
+
+        for li, j, k, base, fwd, bwd in self._lines:
+            w       = nn.W[li][j][k]
+            abs_w   = abs(w)
+            opacity = min(0.15 + abs_w * 0.6, 0.9)
+            sw      = max(1, int(min(0.5 + abs_w * 2.5, 4)))
+            fg      = CYAN if w > 0 else ORANGE
+            self._set(base, fill=blend(fg, opacity), width=sw)
+
+            if is_fwd:
+                self._set(fwd, state=tk.NORMAL, width=sw + 1)
+            else:
+                self._set(fwd, state=tk.HIDDEN)
+
+            gv = 0.0
+            if is_bwd and grads and li < len(grads):
+                if j < len(grads[li]) and k < len(grads[li][j]):
+                    gv = abs(grads[li][j][k])
+            if gv > 0.001:
+                bw = max(1, int(min(1 + gv * 10, 5)))
+                self._set(bwd, state=tk.NORMAL, width=bw)
+            else:
+                self._set(bwd, state=tk.HIDDEN)
+
+        for li, ni, halo, body, label in self._nodes:
+            act  = (acts[li][ni]
+                    if acts and li < len(acts) and ni < len(acts[li])
+                    else 0.5)
+            fill = self._neuron_color(act, li == 0, li == nL - 1)
+            if is_fwd or is_bwd:
+                self._set(halo, state=tk.NORMAL, fill=blend(fill, 0.18))
+            else:
+                self._set(halo, state=tk.HIDDEN)
+            self._set(body, fill=fill)
+            self._set(label, text=f'{act:.2f}')
+
 
 # ─────────────────────────────────────────────────────────
 # LOSS CHART  (port of LossChart SVG component)
 # ─────────────────────────────────────────────────────────
 class LossChart:
-    """Embedded matplotlib chart for loss & accuracy curves."""
+    """
+    Embedded matplotlib chart for loss & accuracy curves.
+    The two Line2D objects persist: new epochs are appended to growable
+    arrays and the lines are blitted over a cached background.  A full
+    canvas draw only happens when the axes must rescale or on resize.
+    """
+
+    MAX_POINTS = 4000      # beyond this, plot ~one point per pixel column
 
     def __init__(self, parent):
         self.fig = Figure(figsize=(4, 1.55), dpi=100,
@@ -378,8 +1152,31 @@ class LossChart:
         self.ax  = self.fig.add_subplot(111, facecolor=PANEL)
         self._style()
 
+        self._n    = 0
+        self._x    = np.empty(1024)
+        self._loss = np.empty(1024)
+        self._acc  = np.empty(1024)
+        self._ymax = 1.0
+        self._bg   = None
+
+        self._loss_line, = self.ax.plot([], [], color=RED, linewidth=1.5,
+                                        label='Loss', animated=True)
+        self._acc_line,  = self.ax.plot([], [], color=CYAN, linewidth=1.5,
+                                        linestyle='--', label='Accuracy',
+                                        animated=True)
+        self._legend = self.ax.legend(fontsize=7, loc='upper right',
+                                      facecolor=PANEL, edgecolor=BORDER)
+        for txt in self._legend.get_texts():
+            txt.set_color(TEXT)
+        self._hint = self.ax.text(0.5, 0.5, 'Training will show loss curve here…',
+                                  transform=self.ax.transAxes,
+                                  ha='center', va='center',
+                                  color=DIM, fontsize=8)
+        self._show_hint(True)
+
         self._canvas = FigureCanvasTkAgg(self.fig, master=parent)
         self._canvas.get_tk_widget().configure(bg=PANEL, highlightthickness=0)
+        self._canvas.mpl_connect('draw_event', self._on_draw)
         self._canvas.draw()
 
     def _style(self):
@@ -393,27 +1190,168 @@ class LossChart:
         ax.set_facecolor(PANEL)
         ax.tick_params(colors=DIM)
 
+    def _show_hint(self, show: bool):
+        self._hint.set_visible(show)
+        self._legend.set_visible(not show)
+        if show:
+            self.ax.set_xlim(0, 10)
+            self.ax.set_ylim(0, 1.05)
+
+    def reset(self):
+        """Forget the plotted history; the next update() redraws fully."""
+        self._n, self._ymax = 0, 1.0
+        self._show_hint(True)
+        self._bg = None
+
     def update(self, history: list):
-        self.ax.cla()
-        self._style()
-        if len(history) < 2:
-            self.ax.text(0.5, 0.5, 'Training will show loss curve here…',
-                         transform=self.ax.transAxes,
-                         ha='center', va='center',
-                         color=DIM, fontsize=8)
+        full = False
+        if len(history) < self._n:          # network was reset
+            self.reset()
+            full = True
+
+        new = history[self._n:]
+        if new:
+            n = self._n + len(new)
+            if n > len(self._x):
+                cap = max(n, 2 * len(self._x))
+                self._x, self._loss, self._acc = (
+                    np.resize(a, cap) for a in (self._x, self._loss, self._acc))
+            self._x[self._n:n]    = [h['epoch']    for h in new]
+            self._loss[self._n:n] = [h['loss']     for h in new]
+            self._acc[self._n:n]  = [h['accuracy'] for h in new]
+            self._ymax = max(self._ymax, float(self._loss[self._n:n].max()))
+            self._n = n
+
+        if self._n >= 2:
+            if self._hint.get_visible():
+                self._show_hint(False)
+                full = True
+            full = self._rescale() or full
+        self._set_line_data()
+
+        if full or self._bg is None:
+            self._canvas.draw()             # _on_draw re-caches and blits
+        else:
+            self._blit()
+
+    def _rescale(self) -> bool:
+        """Grow the axes geometrically, so a rescale (full draw) is rare."""
+        x0, x1 = self.ax.get_xlim()
+        y1     = self.ax.get_ylim()[1]
+        x_lo, x_hi = self._x[0], self._x[self._n - 1]
+        changed = False
+        if x_hi > x1 or x0 != x_lo:
+            self.ax.set_xlim(x_lo, x_lo + max(10, 2 * (x_hi - x_lo)))
+            changed = True
+        if self._ymax * 1.05 > y1:
+            self.ax.set_ylim(0, self._ymax * 1.25)
+            changed = True
+        return changed
+
+    def _set_line_data(self):
+        n = self._n if self._n >= 2 else 0
+        if n > self.MAX_POINTS:
+            px  = max(int(self.ax.bbox.width), 2)
+            idx = np.linspace(0, n - 1, px).astype(int)
+            x, loss, acc = self._x[idx], self._loss[idx], self._acc[idx]
         else:
-            epochs = [h['epoch']    for h in history]
-            losses = [h['loss']     for h in history]
-            accs   = [h['accuracy'] for h in history]
-            self.ax.plot(epochs, losses, color=RED,    linewidth=1.5, label='Loss')
-            self.ax.plot(epochs, accs,   color=CYAN,   linewidth=1.5,
-                         linestyle='--', label='Accuracy')
-            leg = self.ax.legend(fontsize=7, loc='upper right',
-                                 facecolor=PANEL, edgecolor=BORDER)
-            for txt in leg.get_texts():
-                txt.set_color(TEXT)
+            x, loss, acc = self._x[:n], self._loss[:n], self._acc[:n]
+        self._loss_line.set_data(x, loss)
+        self._acc_line.set_data(x, acc)
+
+    def _draw_lines(self):
+        self.ax.draw_artist(self._loss_line)
+        self.ax.draw_artist(self._acc_line)
+
+    def _on_draw(self, _event):
+        self._bg = self._canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_lines()
+
+    def _blit(self):
+        self._canvas.restore_region(self._bg)
+        self._draw_lines()
+        self._canvas.blit(self.ax.bbox)
+
+    def get_widget(self):
+        return self._canvas.get_tk_widget()
+
+
+# ─────────────────────────────────────────────────────────
+# DECISION BOUNDARY
+# ─────────────────────────────────────────────────────────
+class DecisionBoundary:
+    """
+    Learned decision surface: P(class 1) over a G×G grid of the input
+    domain, scored in one predict_batch call and blitted with imshow.
+    G shrinks when one evaluation overruns `budget_s` and creeps back up
+    while there is headroom.
+    """
+
+    G_MIN, G_MAX = 12, 96
+
+    def __init__(self, parent, budget_s: float = 0.0125):
+        self.budget_s = budget_s
+        self.G        = 64
+        self._key     = None    # (network, weight version, domain, G) shown
+        self._domain  = None
+        self._bg      = None
+
+        self.fig = Figure(figsize=(1.9, 1.55), dpi=100,
+                          facecolor=PANEL, tight_layout={'pad': 0.4})
+        self.ax  = self.fig.add_subplot(111, facecolor=PANEL)
+        self.ax.tick_params(colors=DIM, labelsize=6)
+        for sp in self.ax.spines.values():
+            sp.set_edgecolor(BORDER)
+
+        cmap = LinearSegmentedColormap.from_list('boundary', [ORANGE, PANEL, CYAN])
+        self._im = self.ax.imshow(np.full((2, 2), 0.5), cmap=cmap,
+                                  vmin=0.0, vmax=1.0, origin='lower',
+                                  interpolation='bilinear', aspect='auto',
+                                  animated=True)
+
+        self._canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self._canvas.get_tk_widget().configure(bg=PANEL, highlightthickness=0)
+        self._canvas.mpl_connect('draw_event', self._on_draw)
         self._canvas.draw()
 
+    def update(self, network, domain):
+        if not network:
+            return
+        key = (id(network), network._version, domain, self.G)
+        if key == self._key:
+            return
+        self._key = key
+
+        G      = self.G
+        lo, hi = domain
+        t0     = time.perf_counter()
+        axis   = np.linspace(lo, hi, G)
+        xx, yy = np.meshgrid(axis, axis)
+        P = network.predict_batch(np.column_stack([xx.ravel(), yy.ravel()]))
+        self._im.set_data(np.asarray(P, dtype=float).reshape(G, G))
+        self._adapt(time.perf_counter() - t0)
+
+        if domain != self._domain or self._bg is None:
+            self._domain = domain
+            self._im.set_extent((lo, hi, lo, hi))
+            self.ax.set_xlim(lo, hi)
+            self.ax.set_ylim(lo, hi)
+            self._canvas.draw()
+        else:
+            self._canvas.restore_region(self._bg)
+            self.ax.draw_artist(self._im)
+            self._canvas.blit(self.ax.bbox)
+
+    def _adapt(self, dt: float):
+        if dt > self.budget_s and self.G > self.G_MIN:
+            self.G = max(self.G_MIN, int(self.G * 0.75))
+        elif dt < self.budget_s / 4 and self.G < self.G_MAX:
+            self.G = min(self.G_MAX, self.G + 8)
+
+    def _on_draw(self, _event):
+        self._bg = self._canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self._im)
+
     def get_widget(self):
         return self._canvas.get_tk_widget()
 
@@ -458,8 +1396,14 @@ def mk_btn(parent, text, cmd, style='default', font=MONO) -> tk.Button:
 # ─────────────────────────────────────────────────────────
 class App:
     # ── Initialise ────────────────────────────────────────
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, fps: int = UI_FPS,
+                 checkpoint: str = CHECKPOINT, ckpt_every: int = CKPT_EVERY,
+                 resume: bool = False):
         self.root = root
+        self.profiler   = PhaseProfiler()
+        self.fps  = fps
+        self.checkpoint = checkpoint      # path; written by the trainer
+        self.ckpt_every = ckpt_every      # epochs between saves (0 = off)
         root.title('Neural Network Lab')
         root.configure(bg=BG)
         root.geometry('1340x860')
@@ -470,6 +1414,10 @@ class App:
         self.activation   = 'sigmoid'
         self.lr           = 0.5
         self.dataset_key  = 'xor'
+        self.data_seed    = 0             # fixed, so a resumed run sees the same set
+        self.engine       = 'numpy' if HAS_NP else 'python'
+        self.batch_size   = 1             # 1 = SGD, N = mini-batch, 0 = full
+        self.optimizer    = 'sgd'
         self.epochs       = 100
 
         self.network       = None
@@ -482,16 +1430,28 @@ class App:
         self.current_epoch = 0
         self.epoch_log: list = []
 
+        # Training thread → UI hand-off: the trainer publishes into the slot
+        # every epoch, the UI pulls at most `fps` times a second.
+        self._snap_lock  = threading.Lock()
+        self._snapshot   = None
+        self._rate_mark  = (0.0, 0)    # (perf_counter, epoch) for epochs/sec
+        self._data       = None        # (dataset_key, seed, data) memo
+        self._ckpt_writer = None       # thread writing the last checkpoint
+
         # Tk variables
         self._layer_str = tk.StringVar(value='2, 4, 4, 1')
         self._lr_var    = tk.DoubleVar(value=0.5)
         self._epoch_var = tk.IntVar(value=100)
         self._lr_lbl    = tk.StringVar(value='Learning Rate: 0.50')
         self._ep_lbl    = tk.StringVar(value='Epochs: 100')
+        self._bs_var    = tk.IntVar(value=1)
+        self._bs_lbl    = tk.StringVar(value='Batch Size: 1 (SGD)')
+        self._opt_var   = tk.StringVar(value='sgd')
 
         self._build_header()
         self._build_main()
-        self.init_network()
+        if not (resume and self.resume()):
+            self.init_network()
 
     # ─────────────────────────────────────────────────────
     # BUILD HEADER
@@ -581,6 +1541,28 @@ class App:
             self._ds_btns[ds] = b
         self._refresh_ds_btns()
 
+        # --- Engine ---
+        p = make_panel(lf); p.pack(fill='x', pady=(0, 8))
+        section_label(p, 'Engine').pack(fill='x', padx=8, pady=(7, 4))
+        self._eng_btns: dict = {}
+        bf = tk.Frame(p, bg=PANEL); bf.pack(fill='x', padx=8, pady=(0, 8))
+        for eng in ENGINES:
+            b = tk.Button(bf, text=eng, font=MONO, relief='flat',
+                          cursor='hand2',
+                          command=lambda e=eng: self._set_engine(e))
+            b.pack(side='left', expand=True, fill='x', padx=2)
+            self._eng_btns[eng] = b
+        self._refresh_eng_btns()
+        tk.Label(p, textvariable=self._bs_lbl,
+                 bg=PANEL, fg=DIM,
+                 font=('Courier New', 8, 'bold')).pack(anchor='w', padx=8, pady=(0, 2))
+        tk.Scale(p, from_=0, to=64, resolution=1,
+                 orient='horizontal', variable=self._bs_var,
+                 bg=PANEL, fg=MUTED, troughcolor=BORDER,
+                 activebackground=GREEN, sliderrelief='flat',
+                 highlightthickness=0, showvalue=False,
+                 command=self._on_batch_change).pack(fill='x', padx=8, pady=(0, 8))
+
         # --- Epochs ---
         p = make_panel(lf); p.pack(fill='x', pady=(0, 8))
         tk.Label(p, textvariable=self._ep_lbl,
@@ -597,6 +1579,12 @@ class App:
         cf = tk.Frame(lf, bg=BG); cf.pack(fill='x')
         mk_btn(cf, '↻  Reset Network', self.init_network, 'reset').pack(fill='x', pady=(0, 4))
 
+        row = tk.Frame(cf, bg=BG); row.pack(fill='x', pady=(0, 4))
+        mk_btn(row, '⤓  Save',   self.save_checkpoint, 'reset').pack(
+            side='left', fill='x', expand=True, padx=(0, 3))
+        mk_btn(row, '⤒  Resume', self.resume, 'reset').pack(
+            side='left', fill='x', expand=True)
+
         row = tk.Frame(cf, bg=BG); row.pack(fill='x', pady=(0, 4))
         mk_btn(row, '→  Forward',  self.step_forward,  'forward').pack(
             side='left', fill='x', expand=True, padx=(0, 3))
@@ -641,9 +1629,15 @@ class App:
         self._net_canvas = NetworkCanvas(ng, height=230)
         self._net_canvas.grid(row=1, column=0, sticky='nsew', padx=6, pady=(0, 6))
 
-        # --- Loss chart ---
-        lc = make_panel(cf)
-        lc.grid(row=1, column=0, sticky='nsew', pady=(0, 8))
+        # --- Loss chart | decision boundary ---
+        mid = tk.Frame(cf, bg=BG)
+        mid.grid(row=1, column=0, sticky='nsew', pady=(0, 8))
+        mid.grid_rowconfigure(0, weight=1)
+        mid.grid_columnconfigure(0, weight=3)
+        mid.grid_columnconfigure(1, weight=2)
+
+        lc = make_panel(mid)
+        lc.grid(row=0, column=0, sticky='nsew', padx=(0, 8))
         lc.grid_rowconfigure(1, weight=1)
         lc.grid_columnconfigure(0, weight=1)
 
@@ -651,6 +1645,9 @@ class App:
                                 bg=PANEL, fg=DIM,
                                 font=('Courier New', 8, 'bold'))
         self._ep_hdr.grid(row=0, column=0, sticky='w', padx=8, pady=(6, 2))
+        self._eps_lbl = tk.Label(lc, text='', bg=PANEL, fg=GREEN,
+                                 font=('Courier New', 8, 'bold'))
+        self._eps_lbl.grid(row=0, column=0, sticky='e', padx=8, pady=(6, 2))
 
         if HAS_MPL:
             self._loss_chart = LossChart(lc)
@@ -661,6 +1658,24 @@ class App:
                      bg=PANEL, fg=DIM, font=MONO).grid(row=1, column=0)
             self._loss_chart = None
 
+        db = make_panel(mid)
+        db.grid(row=0, column=1, sticky='nsew')
+        db.grid_rowconfigure(1, weight=1)
+        db.grid_columnconfigure(0, weight=1)
+        self._db_hdr = tk.Label(db, text='DECISION BOUNDARY',
+                                bg=PANEL, fg=DIM,
+                                font=('Courier New', 8, 'bold'))
+        self._db_hdr.grid(row=0, column=0, sticky='w', padx=8, pady=(6, 2))
+        if HAS_MPL:
+            # A quarter of the frame budget for one grid evaluation
+            self._boundary = DecisionBoundary(db, budget_s=0.25 / self.fps)
+            self._boundary.get_widget().grid(
+                row=1, column=0, sticky='nsew', padx=6, pady=(0, 6))
+        else:
+            tk.Label(db, text='Install matplotlib for the decision boundary.',
+                     bg=PANEL, fg=DIM, font=MONO_SM, wraplength=160).grid(row=1, column=0)
+            self._boundary = None
+
         # --- Epoch log ---
         el = make_panel(cf)
         el.grid(row=2, column=0, sticky='nsew')
@@ -755,9 +1770,21 @@ class App:
         hp = make_panel(rf); hp.pack(fill='x', pady=(0, 8))
         section_label(hp, 'Hyperparameters').pack(fill='x', padx=8, pady=(7, 2))
         hf2 = tk.Frame(hp, bg=PANEL); hf2.pack(fill='x', padx=8, pady=(0, 8))
+        row_f = tk.Frame(hf2, bg=PANEL); row_f.pack(fill='x', pady=1)
+        tk.Label(row_f, text='Optimizer', bg=PANEL, fg=DIM,
+                 font=('Courier New', 8)).pack(side='left')
+        om = tk.OptionMenu(row_f, self._opt_var, *OPTIMIZERS,
+                           command=self._set_optimizer)
+        om.configure(bg=BORDER, fg=CYAN, font=('Courier New', 8, 'bold'),
+                     activebackground=blend(CYAN, 0.30), activeforeground=CYAN,
+                     relief='flat', bd=0, highlightthickness=0, padx=4, pady=0)
+        om['menu'].configure(bg=PANEL, fg=TEXT, font=MONO_SM,
+                             activebackground=blend(CYAN, 0.30))
+        om.pack(side='right')
         self._hp_lbls: dict = {}
         for name in ('Architecture', 'Activation', 'Learning Rate',
-                     'Dataset', 'Total Params', 'Epoch'):
+                     'Dataset', 'Engine', 'Batch Size', 'Total Params',
+                     'Epoch'):
             row_f = tk.Frame(hf2, bg=PANEL); row_f.pack(fill='x', pady=1)
             tk.Label(row_f, text=name, bg=PANEL, fg=DIM,
                      font=('Courier New', 8)).pack(side='left')
@@ -766,19 +1793,45 @@ class App:
             v.pack(side='right')
             self._hp_lbls[name] = v
 
+        # --- Profile ---
+        pp = make_panel(rf); pp.pack(fill='x', pady=(0, 8))
+        hdr = section_label(pp, 'Profile (ms)'); hdr.pack(fill='x', padx=8, pady=(7, 2))
+        tk.Button(hdr, text='CSV', command=self._dump_profile,
+                  bg=BORDER, fg=MUTED, font=('Courier New', 7, 'bold'),
+                  activebackground=blend(MUTED, 0.30), activeforeground=MUTED,
+                  relief='flat', bd=0, padx=4, pady=0,
+                  cursor='hand2').pack(side='right')
+        pf = tk.Frame(pp, bg=PANEL); pf.pack(fill='x', padx=8, pady=(0, 8))
+        self._prof_lbls: dict = {}
+        self._prof_shown: dict = {}   # phase → text on screen
+        for phase in PHASES:
+            row_f = tk.Frame(pf, bg=PANEL); row_f.pack(fill='x', pady=0)
+            tk.Label(row_f, text=phase, bg=PANEL, fg=DIM,
+                     font=('Courier New', 8)).pack(side='left')
+            v = tk.Label(row_f, text='—', bg=PANEL, fg=MUTED,
+                         font=('Courier New', 8, 'bold'))
+            v.pack(side='right')
+            self._prof_lbls[phase] = v
+
         # --- Weight matrices ---
         wp = make_panel(rf); wp.pack(fill='both', expand=True)
         section_label(wp, 'Weight Matrices').pack(fill='x', padx=8, pady=(7, 2))
 
         wf = tk.Frame(wp, bg=PANEL); wf.pack(fill='both', expand=True, padx=8, pady=(0, 8))
         self._wm_canvas = tk.Canvas(wf, bg=PANEL, highlightthickness=0)
-        wm_sb = tk.Scrollbar(wf, orient='vertical',
-                             command=self._wm_canvas.yview, bg=BORDER)
+        self._wm_sb = tk.Scrollbar(wf, orient='vertical',
+                                   command=self._wm_canvas.yview, bg=BORDER)
         self._wm_inner = tk.Frame(self._wm_canvas, bg=PANEL)
 
-        self._wm_canvas.configure(yscrollcommand=wm_sb.set)
+        # Persistent label grid, rebuilt only when the architecture changes
+        self._wm_shape = None       # [(fan_out, fan_in), ...] of the grid
+        self._wm_grids: list = []   # one Frame per layer
+        self._wm_cells: dict = {}   # (layer, j, k) → Label
+        self._wm_shown: dict = {}   # (layer, j, k) → (text, bg) on screen
+
+        self._wm_canvas.configure(yscrollcommand=self._on_wm_scroll)
         self._wm_canvas.pack(side='left', fill='both', expand=True)
-        wm_sb.pack(side='right', fill='y')
+        self._wm_sb.pack(side='right', fill='y')
 
         self._wm_win = self._wm_canvas.create_window(
             (0, 0), window=self._wm_inner, anchor='nw')
@@ -794,7 +1847,8 @@ class App:
     # ACTIONS
     # ─────────────────────────────────────────────────────
     def init_network(self):
-        self.network       = NeuralNetwork(self.layers, self.activation, self.lr)
+        self.network       = ENGINES[self.engine](self.layers, self.activation,
+                                                  self.lr, self.optimizer)
         self.history       = []
         self.metrics_data  = None
         self.last_result   = None
@@ -804,7 +1858,10 @@ class App:
         self._refresh_all()
 
     def _get_data(self):
-        return DATASETS[self.dataset_key](200)
+        key = (self.dataset_key, self.data_seed)
+        if self._data is None or self._data[:2] != key:
+            self._data = key + (DATASETS[self.dataset_key](200, self.data_seed),)
+        return self._data[2]
 
     def step_forward(self):
         if not self.network or self.is_training:
@@ -829,10 +1886,9 @@ class App:
         if not self.network or self.is_training:
             return
         data = self._get_data()
-        loss, lr = self.network.train_epoch(data)
-        m = self.network.get_metrics(data)
         self.current_epoch += 1
         ep = self.current_epoch
+        loss, lr, m = self._run_epoch(data, ep)
         self.history.append({'epoch': ep, 'loss': loss, 'accuracy': m['accuracy']})
         self.metrics_data = m
         self.last_result  = lr
@@ -846,6 +1902,16 @@ class App:
         })
         self._refresh_all()
 
+    def _run_epoch(self, data, ep):
+        """train_epoch + running metrics, recording their phase timings."""
+        loss, last = self.network.train_epoch(data, self.batch_size)
+        pt = self.network.phase_times
+        self.profiler.add('forward',  pt['forward'],  ep)
+        self.profiler.add('backward', pt['backward'], ep)
+        with self.profiler.timed('metrics', ep):
+            m = self.network.get_metrics(data, online=True)
+        return loss, last, m
+
     def _toggle_training(self):
         if self.is_training:
             self._stop_flag.set()
@@ -856,49 +1922,212 @@ class App:
         self._stop_flag.clear()
         self.is_training = True
         self._refresh_train_btn()
-        threading.Thread(target=self._train_loop, daemon=True).start()
-
-    def _train_loop(self):
-        data   = self._get_data()
+        self._rate_mark = (time.perf_counter(), self.current_epoch)
+        threading.Thread(target=self._train_loop,
+                         args=(self.current_epoch,), daemon=True).start()
+        self._frame_tick()
+
+    def _train_loop(self, start_epoch):
+        data    = self._get_data()
+        dataset = self.dataset_key      # the UI may switch it mid-run
         target = self.epochs
+        ep     = start_epoch
         for e in range(target):
             if self._stop_flag.is_set():
                 break
-            loss, lr_ = self.network.train_epoch(data)
-            m = self.network.get_metrics(data)
-            self.current_epoch += 1
-            ep = self.current_epoch
-            self.history.append({'epoch': ep, 'loss': loss, 'accuracy': m['accuracy']})
-            self.metrics_data = m
-            self.last_result  = lr_
-            self.step_phase   = 'forward' if e % 2 == 0 else 'backward'
+            ep = start_epoch + e + 1
+            loss, last, m = self._run_epoch(data, ep)
+            log = None
             if e % 5 == 0 or e == target - 1:
-                self.epoch_log.append({
+                log = {
                     'epoch': ep, 'loss': f'{loss:.4f}',
                     'acc':  f'{m["accuracy"]*100:.1f}',
                     'f1':   f'{m["f1"]:.3f}',
                     'prec': f'{m["precision"]:.3f}',
                     'rec':  f'{m["recall"]:.3f}',
-                })
-            self.root.after(0, self._refresh_all)
-            time.sleep(0.03)
+                }
+            self._publish(ep, loss, m, last,
+                          'forward' if e % 2 == 0 else 'backward', log)
+            if self.ckpt_every and ep % self.ckpt_every == 0:
+                self._write_async(self._checkpoint_blob(ep, dataset))
+        if self.ckpt_every and ep > start_epoch and ep % self.ckpt_every:
+            self._write_async(self._checkpoint_blob(ep, dataset))   # final state
         self.is_training = False
-        self.root.after(0, self._refresh_train_btn)
+
+    def _publish(self, ep, loss, m, last, phase, log):
+        """Trainer side: overwrite the latest-state slot (stale frames are
+        dropped) while keeping every history / log row for the UI.
+        `last` is copied: the compact engine returns its reused buffers,
+        which the trainer keeps overwriting while the UI draws them."""
+        last = copy.deepcopy(last)
+        with self._snap_lock:
+            snap = self._snapshot
+            if snap is None:
+                snap = self._snapshot = {'history': [], 'log': []}
+            snap.update(epoch=ep, metrics=m, last=last, phase=phase)
+            snap['history'].append({'epoch': ep, 'loss': loss,
+                                    'accuracy': m['accuracy']})
+            if log:
+                snap['log'].append(log)
+
+    def _frame_tick(self):
+        """UI side: apply the newest snapshot, then reschedule at `fps`."""
+        running = self.is_training          # read before pulling the slot
+        with self._snap_lock:
+            snap, self._snapshot = self._snapshot, None
+            if snap:   # merged under the lock so checkpoints see every row
+                self.history.extend(snap['history'])
+                self.epoch_log.extend(snap['log'])
+        if snap:
+            self.current_epoch = snap['epoch']
+            self.metrics_data  = snap['metrics']
+            self.last_result   = snap['last']
+            self.step_phase    = snap['phase']
+            self._update_rate(force=not running)
+            self._refresh_all()
+        if running:
+            self.root.after(max(1, int(1000 / self.fps)), self._frame_tick)
+        else:
+            self._refresh_train_btn()
+
+    # ── Checkpoints ───────────────────────────────────────
+    def _checkpoint_blob(self, epoch, dataset=None) -> bytes:
+        """
+        Pickle the full training state.  Runs on the training thread between
+        epochs (the network is idle); the history still waiting in the
+        snapshot slot is included.  Engine, layers, activation and
+        optimizer come from the network itself: the UI fields may hold
+        edits that only take effect on Reset.  Likewise the trainer passes
+        the `dataset` it is training on (default: the selected one).
+        """
+        net = self.network
+        with self._snap_lock:
+            pending = self._snapshot or {'history': [], 'log': []}
+            history = self.history + pending['history']
+            log     = self.epoch_log + pending['log']
+        return pickle.dumps({
+            'engine': next(k for k, cls in ENGINES.items() if type(net) is cls),
+            'layers': list(net.sizes),
+            'activation': net.activation, 'optimizer': net.optimizer.name,
+            'batch_size': self.batch_size,
+            'dataset': dataset or self.dataset_key,
+            'data_seed': self.data_seed, 'epoch': epoch,
+            'history': history, 'epoch_log': log,
+            'rng': random.getstate(),
+            'network': self.network.get_state(),
+        }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _write_async(self, blob: bytes):
+        """Write on a helper thread, so neither UI nor trainer waits on disk.
+        Writes stay in order: each one waits for the previous to finish."""
+        prev = self._ckpt_writer
+
+        def write():
+            if prev:
+                prev.join()
+            try:
+                write_checkpoint(self.checkpoint, blob)
+            except OSError:
+                pass
+        self._ckpt_writer = threading.Thread(target=write, daemon=True)
+        self._ckpt_writer.start()
+
+    def save_checkpoint(self):
+        if not self.network or self.is_training:
+            return      # the trainer saves on its own while running
+        self._write_async(self._checkpoint_blob(self.current_epoch))
+
+    def resume(self, path=None) -> bool:
+        """
+        Restore the state saved in the checkpoint file; False if there is
+        none or it is malformed (nothing is changed then).
+        """
+        if self.is_training:
+            return False
+        ck = read_checkpoint(path or self.checkpoint)
+        if not isinstance(ck, dict) or any(k not in ck for k in CHECKPOINT_KEYS) \
+                or ck['engine'] not in ENGINES or ck['dataset'] not in DATASETS:
+            return False
+        try:
+            net = ENGINES[ck['engine']](ck['layers'], ck['activation'],
+                                        ck['network']['lr'], ck['optimizer'])
+            net.set_state(ck['network'])
+            random.setstate(ck['rng'])  # after __init__ drew its weights
+        except (KeyError, TypeError, ValueError):   # malformed state, or
+            return False                            # settings / weights disagree
+
+        self.engine, self.layers      = ck['engine'], list(ck['layers'])
+        self.activation, self.optimizer = ck['activation'], ck['optimizer']
+        self.lr, self.batch_size      = net.lr, ck['batch_size']
+        self.dataset_key, self.data_seed = ck['dataset'], ck['data_seed']
+        self.network       = net
+        self.history       = ck['history']
+        self.epoch_log     = ck['epoch_log']
+        self.current_epoch = ck['epoch']
+        self.metrics_data  = net.get_metrics(self._get_data())
+        self.last_result   = None
+        self.step_phase    = None
+
+        self._layer_str.set(', '.join(map(str, self.layers)))
+        self._lr_var.set(self.lr);         self._on_lr_change(self.lr)
+        self._bs_var.set(self.batch_size); self._on_batch_change(self.batch_size)
+        self._opt_var.set(self.optimizer)
+        self._refresh_act_btns()
+        self._refresh_ds_btns()
+        self._refresh_eng_btns()
+        if HAS_MPL and self._loss_chart:
+            self._loss_chart.reset()
+        self._refresh_all()
+        return True
+
+    def _update_rate(self, force=False):
+        t0, ep0 = self._rate_mark
+        now     = time.perf_counter()
+        if now - t0 >= 0.5 or (force and now > t0):
+            rate = (self.current_epoch - ep0) / (now - t0)
+            self._eps_lbl.configure(text=f'{rate:,.1f} epochs/sec')
+            self._rate_mark = (now, self.current_epoch)
 
     # ─────────────────────────────────────────────────────
     # UI REFRESH
     # ─────────────────────────────────────────────────────
     def _refresh_all(self):
-        self._net_canvas.update_state(self.network, self.last_result, self.step_phase)
+        prof, ep = self.profiler, self.current_epoch
+        with prof.timed('canvas', ep):
+            self._net_canvas.update_state(self.network, self.last_result,
+                                          self.step_phase)
         self._update_phase_label()
         self._ep_hdr.configure(text=f'TRAINING PROGRESS — Epoch {self.current_epoch}')
         if HAS_MPL and self._loss_chart:
-            self._loss_chart.update(self.history)
+            with prof.timed('chart', ep):
+                self._loss_chart.update(self.history)
+        if HAS_MPL and self._boundary:
+            with prof.timed('boundary', ep):
+                self._boundary.update(self.network, DOMAINS[self.dataset_key])
+            self._db_hdr.configure(
+                text=f'DECISION BOUNDARY — {self._boundary.G}×{self._boundary.G}')
         self._update_epoch_log()
         self._update_metrics()
         self._update_confusion()
         self._update_hyperparams()
-        self._update_weights()
+        with prof.timed('weights', ep):
+            self._update_weights()
+        self._update_profile()
+
+    def _update_profile(self):
+        for phase, ms in self.profiler.means().items():
+            text = '—' if ms is None else f'{ms:.2f}'
+            if self._prof_shown.get(phase) != text:
+                self._prof_lbls[phase].configure(text=text)
+                self._prof_shown[phase] = text
+
+    def _dump_profile(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.root, title='Save profile as CSV',
+            defaultextension='.csv', initialfile='nn_profile.csv',
+            filetypes=[('CSV', '*.csv'), ('All files', '*')])
+        if path:
+            self.profiler.dump_csv(path)
 
     def _update_phase_label(self):
         if self.step_phase == 'forward':
@@ -959,39 +2188,72 @@ class App:
             'Activation':   self.activation,
             'Learning Rate': f'{self.lr:.2f}',
             'Dataset':      self.dataset_key,
+            'Engine':       self.engine,
+            'Batch Size':   str(self.batch_size or 'full'),
             'Total Params': str(self.network.total_params),
             'Epoch':        str(self.current_epoch),
         }
         for k, lbl in self._hp_lbls.items():
             lbl.configure(text=vals.get(k, '—'))
 
-    def _update_weights(self):
-        if not self.network:
-            return
+    def _build_weight_grid(self, shape):
         for w in self._wm_inner.winfo_children():
             w.destroy()
-        for li, layer in enumerate(self.network.W):
+        self._wm_shape = shape
+        self._wm_grids, self._wm_cells, self._wm_shown = [], {}, {}
+        for li, (fo, fi) in enumerate(shape):
             tk.Label(self._wm_inner,
                      text=f'Layer {li} → {li+1} weights',
                      bg=PANEL, fg=DIM,
                      font=('Courier New', 8)).pack(anchor='w', pady=(4, 2))
             grid = tk.Frame(self._wm_inner, bg=PANEL)
             grid.pack(fill='x')
+            for j in range(fo):
+                for k in range(fi):
+                    lbl = tk.Label(grid,
+                                   bg=PANEL, fg=TEXT,
+                                   font=('Courier New', 7),
+                                   relief='flat', padx=3, pady=2,
+                                   highlightthickness=1,
+                                   highlightbackground=blend(MUTED, 0.08))
+                    lbl.grid(row=j, column=k, padx=1, pady=1, sticky='nsew')
+                    self._wm_cells[li, j, k] = lbl
+            for k in range(fi):
+                grid.grid_columnconfigure(k, weight=1)
+            self._wm_grids.append(grid)
+
+    def _update_weights(self):
+        if not self.network:
+            return
+        shape = [(len(Wl), len(Wl[0])) for Wl in self.network.W]
+        if shape != self._wm_shape:
+            self._build_weight_grid(shape)
+        if not self._wm_canvas.winfo_ismapped():
+            return
+
+        # Only layers overlapping the visible part of the scroll area
+        top, bottom = self._wm_canvas.yview()
+        inner_h     = self._wm_inner.winfo_height()
+        y0, y1      = top * inner_h, bottom * inner_h
+        for li, (grid, layer) in enumerate(zip(self._wm_grids, self.network.W)):
+            gy = grid.winfo_y()
+            if inner_h > 1 and (gy > y1 or gy + grid.winfo_height() < y0):
+                continue
             for j, row in enumerate(layer):
                 for k, w in enumerate(row):
                     abs_w = min(abs(w), 2.0)
                     intensity = abs_w / 2.0
                     bg_c = (blend(CYAN,   0.10 + intensity * 0.50) if w >= 0
                             else blend(ORANGE, 0.10 + intensity * 0.50))
-                    tk.Label(grid,
-                             text=f'{w:+.3f}',
-                             bg=bg_c, fg=TEXT,
-                             font=('Courier New', 7),
-                             relief='flat', padx=3, pady=2,
-                             highlightthickness=1,
-                             highlightbackground=blend(MUTED, 0.08)).grid(
-                        row=j, column=k, padx=1, pady=1, sticky='nsew')
-                    grid.grid_columnconfigure(k, weight=1)
+                    cell = (f'{w:+.3f}', bg_c)
+                    if self._wm_shown.get((li, j, k)) != cell:
+                        self._wm_shown[li, j, k] = cell
+                        self._wm_cells[li, j, k].configure(text=cell[0], bg=bg_c)
+
+    def _on_wm_scroll(self, first, last):
+        # Layers skipped while out of view catch up as they scroll in
+        self._wm_sb.set(first, last)
+        self._update_weights()
 
     # ─────────────────────────────────────────────────────
     # CONFIG HANDLERS
@@ -1012,6 +2274,12 @@ class App:
         self.activation = act
         self._refresh_act_btns()
 
+    def _set_optimizer(self, name: str):
+        # Takes effect immediately, with fresh optimizer state
+        self.optimizer = name
+        if self.network:
+            self.network.optimizer = OPTIMIZERS[name]()
+
     def _on_lr_change(self, val):
         self.lr = round(float(val), 2)
         self._lr_lbl.set(f'Learning Rate: {self.lr:.2f}')
@@ -1020,6 +2288,19 @@ class App:
         self.dataset_key = ds
         self._refresh_ds_btns()
 
+    def _set_engine(self, eng: str):
+        self.engine = eng
+        self._refresh_eng_btns()
+
+    def _on_batch_change(self, val):
+        self.batch_size = int(float(val))
+        if self.batch_size == 0:
+            self._bs_lbl.set('Batch Size: full')
+        elif self.batch_size == 1:
+            self._bs_lbl.set('Batch Size: 1 (SGD)')
+        else:
+            self._bs_lbl.set(f'Batch Size: {self.batch_size}')
+
     def _on_epoch_change(self, val):
         self.epochs = int(float(val))
         self._ep_lbl.set(f'Epochs: {self.epochs}')
@@ -1047,6 +2328,15 @@ class App:
                 btn.configure(bg=BORDER, fg=DIM,
                               activebackground=BORDER)
 
+    def _refresh_eng_btns(self):
+        for eng, btn in self._eng_btns.items():
+            if eng == self.engine:
+                btn.configure(bg=blend(GREEN, 0.20), fg=GREEN,
+                              activebackground=blend(GREEN, 0.30))
+            else:
+                btn.configure(bg=BORDER, fg=DIM,
+                              activebackground=BORDER)
+
     def _refresh_train_btn(self):
         if self.is_training:
             self._train_all_btn.configure(
@@ -1065,10 +2355,24 @@ class App:
 # ─────────────────────────────────────────────────────────
 # ENTRY POINT
 # ─────────────────────────────────────────────────────────
-def main():
+def main(argv=None):
+    ap = argparse.ArgumentParser(description='Neural Network Lab')
+    ap.add_argument('--resume', action='store_true',
+                    help='start from the saved checkpoint, if there is one')
+    ap.add_argument('--checkpoint', default=CHECKPOINT,
+                    help=f'checkpoint file (default: {CHECKPOINT})')
+    ap.add_argument('--checkpoint-every', type=int, default=CKPT_EVERY,
+                    help='epochs between checkpoints while training (0 = off)')
+    ap.add_argument('--profile-csv', metavar='PATH',
+                    help='write the per-phase timing log here on exit')
+    args = ap.parse_args(argv)
+
     root = tk.Tk()
-    App(root)
+    app  = App(root, checkpoint=args.checkpoint,
+               ckpt_every=args.checkpoint_every, resume=args.resume)
     root.mainloop()
+    if args.profile_csv:
+        app.profiler.dump_csv(args.profile_csv)
 
 
 if __name__ == '__main__':
@@ -1,3 +1,10 @@
+import argparse
+import mmap
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.metrics.pairwise import cosine_similarity
@@ -62,38 +69,45 @@ def plot_vectors_2d(vectors, ax=None, origin=(0, 0), colors=None):
 
 
 def plot_heatmap(matrix, ax=None, title="Heatmap", cmap="Blues", vmin=None, vmax=None,
-                 annotate=True, fmt="{:.2f}"):
+                 annotate=True, fmt="{:.2f}", aggregate="mean", max_annotated=None):
     """
     Generic heatmap helper using imshow.
+    matrix may be an array, a memmap or a path for open_embeddings. When it
+    has more cells than the axes has pixels, blocks are reduced with
+    aggregate ("mean", "max" or "min"; None draws every cell) first,
+    streaming the matrix, so huge matrices render in bounded memory.
+    Cells are annotated only up to max_annotated (default ANNOTATE_MAX_CELLS).
     """
     if ax is None:
         fig, ax = plt.subplots()
 
-    im = ax.imshow(matrix, cmap=cmap, vmin=vmin, vmax=vmax)
+    cells, extent = heatmap_cells(matrix, ax, aggregate)
+    im = ax.imshow(cells, cmap=cmap, vmin=vmin, vmax=vmax, extent=extent)
     ax.set_title(title)
     ax.set_xlabel("Vector index")
     ax.set_ylabel("Vector index")
 
-    n = matrix.shape[0]
-    ax.set_xticks(range(n))
-    ax.set_yticks(range(n))
-
-    if annotate:
-        for i in range(n):
-            for j in range(n):
-                val = matrix[i, j]
-                ax.text(
-                    j, i, fmt.format(val),
-                    ha="center", va="center",
-                    color="white" if (vmin is not None and vmax is not None and abs(val - (vmin + vmax) / 2) > (vmax - vmin) / 4) else "black",
-                    fontsize=7
-                )
+    max_annotated = ANNOTATE_MAX_CELLS if max_annotated is None else max_annotated
+    if extent is None and cells.size <= max_annotated:
+        ax.set_xticks(range(cells.shape[1]))
+        ax.set_yticks(range(cells.shape[0]))
+
+        if annotate:
+            for i in range(cells.shape[0]):
+                for j in range(cells.shape[1]):
+                    val = cells[i, j]
+                    ax.text(
+                        j, i, fmt.format(val),
+                        ha="center", va="center",
+                        color="white" if (vmin is not None and vmax is not None and abs(val - (vmin + vmax) / 2) > (vmax - vmin) / 4) else "black",
+                        fontsize=7
+                    )
 
     plt.colorbar(im, ax=ax, fraction=0.046, pad=0.04)
     return ax
 
 
-def plot_cosine_similarity_matrix(sim_matrix, ax=None):
+def plot_cosine_similarity_matrix(sim_matrix, ax=None, aggregate="mean"):
     """
     Visualize cosine similarity matrix as a heatmap.
     """
@@ -102,35 +116,467 @@ def plot_cosine_similarity_matrix(sim_matrix, ax=None):
         title="Cosine Similarity Matrix",
         cmap="Blues",
         vmin=-1, vmax=1,
-        annotate=True, fmt="{:.2f}"
+        annotate=True, fmt="{:.2f}", aggregate=aggregate
     )
 
 
-def pairwise_l1_distances(X):
+# Upper bound on the scratch memory of one tile in the blocked engine below.
+DEFAULT_MEMORY_BUDGET = 256 * 2**20  # bytes
+
+
+def _l1_tile(A, B):
+    diffs = np.subtract(A[:, None, :], B[None, :, :])
+    return np.abs(diffs, out=diffs).sum(axis=-1)
+
+
+def _chebyshev_tile(A, B):
+    diffs = np.subtract(A[:, None, :], B[None, :, :])
+    return np.abs(diffs, out=diffs).max(axis=-1)
+
+
+def _l2_tile(A, B, a_sq, b_sq):
+    # ||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b, one GEMM per tile
+    d2 = A @ B.T
+    d2 *= -2
+    d2 += a_sq[:, None]
+    d2 += b_sq[None, :]
+    np.maximum(d2, 0, out=d2)  # rounding can push ~0 slightly negative
+    return np.sqrt(d2, out=d2)
+
+
+def _squared_norms(A):
+    return np.einsum("ij,ij->i", A, A)
+
+
+DISTANCE_METRICS = ("l1", "l2", "chebyshev")  # lower is nearer
+SIMILARITY_METRICS = ("cosine", "inner")      # higher is nearer
+
+
+def _prepare_block(metric, block, dtype):
+    """Cast a block of rows and precompute what its tiles need."""
+    block = block.astype(dtype, copy=False)
+    if metric == "l2":
+        return block, _squared_norms(block)
+    if metric == "cosine":
+        norms = np.linalg.norm(block, axis=1)
+        norms[norms == 0] = 1  # zero vectors get similarity 0, like sklearn
+        return block / norms[:, None], None
+    return block, None
+
+
+def _metric_tile(metric, A, a_aux, B, b_aux):
+    """(len(A) x len(B)) tile of `metric` between two prepared blocks."""
+    if metric == "l2":
+        return _l2_tile(A, B, a_aux, b_aux)
+    if metric == "l1":
+        return _l1_tile(A, B)
+    if metric == "chebyshev":
+        return _chebyshev_tile(A, B)
+    return A @ B.T  # inner, or cosine on unit rows
+
+
+def _bytes_per_pair(metric, d, itemsize):
+    if metric in DISTANCE_METRICS and metric != "l2":
+        return d * itemsize  # broadcast diff
+    return itemsize          # GEMM output
+
+
+def _bytes_per_row(metric, d, itemsize):
+    """Scratch of one prepared input row: its cast copy plus norms."""
+    if metric == "cosine":
+        return (2 * d + 1) * itemsize  # cast copy and the normalized result
+    return (d + 1) * itemsize
+
+
+def _tile_shape(n, m, bytes_per_pair, memory_budget, row_bytes=0, col_bytes=0):
+    """
+    Rows x columns of a tile whose scratch fits in memory_budget:
+    bytes_per_pair per output cell, plus row_bytes per row and col_bytes
+    per column for the prepared input blocks. Whole rows of the output are
+    preferred, but the column block may take at most half the budget.
+    """
+    cols = max(1, min(m, int(memory_budget // bytes_per_pair)))
+    if col_bytes:
+        cols = max(1, min(cols, int(memory_budget // 2 // col_bytes)))
+    rows = (memory_budget - cols * col_bytes) // (cols * bytes_per_pair + row_bytes)
+    return max(1, min(n, int(rows))), cols
+
+
+def pairwise_distances(X, Y=None, metric="l2", dtype=np.float64,
+                       memory_budget=DEFAULT_MEMORY_BUDGET, out=None):
+    """
+    Pairwise distances between the rows of X (n x d) and Y (m x d), computed
+    tile by tile so that no temporary grows past ~memory_budget bytes.
+    metric: "l1", "l2" or "chebyshev". L2 uses ||x||^2 + ||y||^2 - 2 x.y,
+    so a tile costs one matrix product instead of an (rows x cols x d) diff.
+    dtype: np.float64 or np.float32 (half the memory and bandwidth; L2 loses
+    precision for near-identical points). Inputs are cast one block at a time.
+    out: optional (n x m) array (e.g. a memmap) to write into.
+    Returns an (n x m) matrix, or (n x n) with Y=None.
+    """
+    if metric not in DISTANCE_METRICS:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of {DISTANCE_METRICS}.")
+    return _pairwise_into(X, Y, metric, np.dtype(dtype), memory_budget, out)
+
+
+def _pairwise_into(X, Y, metric, dtype, memory_budget, out):
+    X, Y, same = _check_pair(X, Y)
+    out = _check_out(out, (X.shape[0], Y.shape[0]), dtype)
+    _fill_pairwise(X, Y, metric, dtype, memory_budget, out)
+    if same and metric == "l2":
+        # The identity leaves rounding noise where the exact answer is 0.
+        np.fill_diagonal(out, 0)
+    return out
+
+
+def _check_pair(X, Y):
+    """(X, Y, same): Y defaults to X; both must be 2-D with one width."""
+    same = Y is None
+    X = np.asarray(X) if not isinstance(X, np.ndarray) else X
+    Y = X if same else (np.asarray(Y) if not isinstance(Y, np.ndarray) else Y)
+    if X.ndim != 2 or Y.ndim != 2 or X.shape[1] != Y.shape[1]:
+        raise ValueError(f"X and Y must be 2-D with the same width, got {X.shape} and {Y.shape}.")
+    return X, Y, same
+
+
+def _check_out(out, shape, dtype):
+    if out is None:
+        return np.empty(shape, dtype=dtype)
+    if out.shape != shape:
+        raise ValueError(f"out has shape {out.shape}, expected {shape}.")
+    return out
+
+
+def _fill_pairwise(X, Y, metric, dtype, memory_budget, out):
+    """Write the (len(X) x len(Y)) `metric` matrix into out, tile by tile."""
+    n, m, d = X.shape[0], Y.shape[0], X.shape[1]
+    per_row = _bytes_per_row(metric, d, dtype.itemsize)
+    rows, cols = _tile_shape(n, m, _bytes_per_pair(metric, d, dtype.itemsize), memory_budget,
+                             per_row, per_row)
+    for j0 in range(0, m, cols):
+        B, b_aux = _prepare_block(metric, Y[j0:j0 + cols], dtype)
+        for i0 in range(0, n, rows):
+            A, a_aux = _prepare_block(metric, X[i0:i0 + rows], dtype)
+            out[i0:i0 + len(A), j0:j0 + len(B)] = _metric_tile(metric, A, a_aux, B, b_aux)
+
+
+# Multi-process engine. Inputs and output are shared with the workers by
+# name, never pickled: a (kind, name, offset, shape, dtype) spec per array,
+# where kind is "shm" (multiprocessing.shared_memory) or "memmap" (a file
+# the workers map themselves).
+_WORKER_ARRAYS = {}
+
+
+def _open_shared_memory(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _attach_arrays(specs):
+    """Pool initializer: map every shared array once per worker."""
+    _WORKER_ARRAYS.clear()
+    for key, (kind, name, offset, shape, dtype) in specs.items():
+        if kind == "shm":
+            shm = _open_shared_memory(name)
+            _WORKER_ARRAYS[key] = (shm, np.ndarray(shape, dtype, buffer=shm.buf))
+        else:
+            mode = "r+" if key == "out" else "r"
+            _WORKER_ARRAYS[key] = (None, np.memmap(name, dtype, mode, offset, shape))
+
+
+def _pairwise_band(i0, i1, metric, dtype, memory_budget):
+    X = _WORKER_ARRAYS["X"][1]
+    Y = _WORKER_ARRAYS["Y"][1] if "Y" in _WORKER_ARRAYS else X
+    out = _WORKER_ARRAYS["out"][1]
+    _fill_pairwise(X[i0:i1], Y, metric, np.dtype(dtype), memory_budget, out[i0:i1])
+    return i1 - i0
+
+
+def _memmap_spec(array, dtype):
+    # Only a whole mapping (base is the mmap itself, not a slice of one)
+    # can be reopened from filename / offset.
+    if isinstance(array, np.memmap) and isinstance(array.base, mmap.mmap) \
+            and array.dtype == dtype and array.flags.c_contiguous:
+        return ("memmap", array.filename, array.offset, array.shape, dtype.str)
+    return None
+
+
+def _share(array, dtype, owned, copy=True):
+    """
+    Spec for passing `array` to workers. A memmap of the right dtype is
+    shared through its file; otherwise a shared-memory block is created
+    (filled with `array` cast to dtype if copy) and appended to `owned`.
+    """
+    spec = _memmap_spec(array, dtype)
+    if spec:
+        return spec
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.size * dtype.itemsize))
+    owned.append(shm)
+    if copy:
+        np.ndarray(array.shape, dtype, buffer=shm.buf)[...] = array
+    return ("shm", shm.name, 0, array.shape, dtype.str)
+
+
+def pairwise_parallel(X, Y=None, metric="l2", workers=None, dtype=np.float64,
+                      memory_budget=DEFAULT_MEMORY_BUDGET, out=None):
+    """
+    pairwise_distances spread over a process pool. X / Y live in shared
+    memory (or stay in their memmap files) and every worker writes its row
+    band straight into a shared output; an `out` memmap is written in place.
+    metric: "l1", "l2", "chebyshev", "inner" or "cosine".
+    workers: pool size (default: all cores). memory_budget is split evenly
+    between the workers. Any other `out` is filled from a shared buffer at
+    the end, so pass a memmap to avoid holding the result twice.
+    Returns an (n x m) matrix, or (n x n) with Y=None.
+    """
+    if metric not in DISTANCE_METRICS + SIMILARITY_METRICS:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of "
+                         f"{DISTANCE_METRICS + SIMILARITY_METRICS}.")
+    X, Y, same = _check_pair(X, Y)
+    dtype = np.dtype(dtype)
+    workers = workers or os.cpu_count() or 1
+    n, m = X.shape[0], Y.shape[0]
+    out = _check_out(out, (n, m), dtype)
+
+    owned = []
+    try:
+        specs = {"X": _share(X, dtype, owned)}
+        if not same:
+            specs["Y"] = _share(Y, dtype, owned)
+        specs["out"] = _share(out, dtype, owned, copy=False)
+
+        # ~4 bands per worker keeps the pool busy when bands finish unevenly
+        band = max(1, -(-n // (4 * workers)))
+        with ProcessPoolExecutor(workers, initializer=_attach_arrays, initargs=(specs,)) as pool:
+            futures = [pool.submit(_pairwise_band, i0, min(n, i0 + band), metric,
+                                   dtype.str, memory_budget // workers)
+                       for i0 in range(0, n, band)]
+            for f in futures:
+                f.result()
+
+        if specs["out"][0] == "shm":
+            out[...] = np.ndarray((n, m), dtype, buffer=owned[-1].buf)
+    finally:
+        for shm in owned:
+            shm.close()
+            shm.unlink()
+
+    if same and metric == "l2":
+        np.fill_diagonal(out, 0)
+    return out
+
+
+def pairwise_l1_distances(X, Y=None, **kwargs):
     """
     Pairwise L1 (Manhattan / cityblock) distances: sum_i |x_i - y_i|
-    Returns an (n x n) matrix. Implemented with broadcasting.
+    Returns an (n x n) matrix (n x m against Y). Computed in memory-bounded
+    tiles, see pairwise_distances.
     """
-    diffs = X[:, None, :] - X[None, :, :]
-    return np.sum(np.abs(diffs), axis=-1)
+    return pairwise_distances(X, Y, metric="l1", **kwargs)
 
 
-def pairwise_l2_distances(X):
+def pairwise_l2_distances(X, Y=None, **kwargs):
     """
     Pairwise L2 (Euclidean) distances: sqrt(sum_i (x_i - y_i)^2)
-    Returns an (n x n) matrix. Implemented with broadcasting.
+    Returns an (n x n) matrix (n x m against Y). Computed in memory-bounded
+    tiles, see pairwise_distances.
     """
-    diffs = X[:, None, :] - X[None, :, :]
-    return np.linalg.norm(diffs, ord=2, axis=-1)
+    return pairwise_distances(X, Y, metric="l2", **kwargs)
 
 
-def pairwise_chebyshev_distances(X):
+def pairwise_chebyshev_distances(X, Y=None, **kwargs):
     """
     Pairwise Chebyshev distances: max_i |x_i - y_i|
-    Returns an (n x n) matrix. Implemented with broadcasting.
+    Returns an (n x n) matrix (n x m against Y). Computed in memory-bounded
+    tiles, see pairwise_distances.
+    """
+    return pairwise_distances(X, Y, metric="chebyshev", **kwargs)
+
+
+def _smallest_k(scores, idx, k):
+    if scores.shape[1] <= k:
+        return scores, idx
+    part = np.argpartition(scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(scores, part, axis=1), np.take_along_axis(idx, part, axis=1)
+
+
+def _merge_topk(best_s, best_i, tile, offset, k):
+    """
+    Fold a score tile (columns offset, offset+1, ...) into the running
+    per-row k smallest. The tile is cut to k first, so the concatenation
+    only ever holds 2k columns.
+    """
+    if tile.shape[1] > k:
+        part = np.argpartition(tile, k - 1, axis=1)[:, :k]
+        tile_s, tile_i = np.take_along_axis(tile, part, axis=1), part + offset
+    else:
+        tile_s = tile
+        tile_i = np.broadcast_to(np.arange(offset, offset + tile.shape[1]), tile.shape)
+    return _smallest_k(np.concatenate([best_s, tile_s], axis=1),
+                       np.concatenate([best_i, tile_i], axis=1), k)
+
+
+def topk(queries, corpus, k, metric="cosine", dtype=np.float64,
+         memory_budget=DEFAULT_MEMORY_BUDGET):
     """
-    diffs = X[:, None, :] - X[None, :, :]
-    return np.max(np.abs(diffs), axis=-1)
+    The k nearest corpus rows of every query row, without building the full
+    (q x n) score matrix: corpus blocks are streamed and each query keeps a
+    running top-k, merged with argpartition.
+    metric: "cosine" or "inner" (higher is nearer), "l1", "l2" or
+    "chebyshev" (lower is nearer). dtype / memory_budget as in
+    pairwise_distances.
+    Returns (indices, scores), both (q x k), nearest first.
+    """
+    queries = np.atleast_2d(np.asarray(queries))
+    corpus = np.asarray(corpus)
+    if queries.shape[1] != corpus.shape[1]:
+        raise ValueError(f"queries and corpus widths differ: {queries.shape} vs {corpus.shape}.")
+    if metric not in DISTANCE_METRICS + SIMILARITY_METRICS:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of "
+                         f"{DISTANCE_METRICS + SIMILARITY_METRICS}.")
+    if k < 1:
+        raise ValueError(f"k must be at least 1, got {k}.")
+
+    dtype = np.dtype(dtype)
+    q, n, d = queries.shape[0], corpus.shape[0], corpus.shape[1]
+    k = min(k, n)
+    sign = -1 if metric in SIMILARITY_METRICS else 1  # rank everything as "lower is nearer"
+    # per cell: the tile itself plus the (score, index) merge candidates;
+    # per row / column: the prepared block, and per query its running top-k
+    per_pair = _bytes_per_pair(metric, d, dtype.itemsize) + dtype.itemsize + 8
+    per_row = _bytes_per_row(metric, d, dtype.itemsize)
+    rows, cols = _tile_shape(q, n, per_pair, memory_budget,
+                             per_row + 2 * k * (dtype.itemsize + 8), per_row)
+
+    return _streamed_topk(
+        q, n, k, rows, cols,
+        lambda i0, i1: _prepare_block(metric, queries[i0:i1], dtype),
+        lambda j0, j1: _prepare_block(metric, corpus[j0:j1], dtype),
+        lambda a, b: _metric_tile(metric, *a, *b),
+        sign, dtype)
+
+
+def _streamed_topk(q, n, k, rows, cols, query_block, corpus_block, score_tile, sign, dtype):
+    """
+    The loop shared by the top-k searches. Query blocks are the outer loop,
+    so each is prepared once and only its running top-k is held; corpus
+    blocks are streamed past it (once per query block) and every tile is
+    folded in.
+    query_block(i0, i1) / corpus_block(j0, j1) prepare rows for
+    score_tile(a, b); sign is -1 when higher scores are nearer.
+    """
+    indices, scores = [], []
+    for i0 in range(0, q, rows):
+        a = query_block(i0, min(q, i0 + rows))
+        best_s = np.empty((min(rows, q - i0), 0), dtype=dtype)
+        best_i = np.empty((len(best_s), 0), dtype=np.int64)
+        for j0 in range(0, n, cols):
+            tile = score_tile(a, corpus_block(j0, min(n, j0 + cols)))
+            if sign < 0:
+                np.negative(tile, out=tile)
+            best_s, best_i = _merge_topk(best_s, best_i, tile, j0, k)
+        order = np.argsort(best_s, axis=1, kind="stable")
+        indices.append(np.take_along_axis(best_i, order, axis=1))
+        scores.append(sign * np.take_along_axis(best_s, order, axis=1))
+    return np.concatenate(indices), np.concatenate(scores)
+
+
+# Quantized storage for ranking by inner product / cosine.
+# int8: per-row scale s = max|x| / 127, codes = round(x / s); 1 byte a value.
+# float16: half precision, no scales; 2 bytes a value.
+# Tiles are scored with a float32 GEMM (NumPy has no BLAS for int8 / float16).
+# int8 products are at most 127^2, so the float32 sums are exact integers
+# (what an int32 accumulator would give) for dim up to 2^24 / 127^2 = 1040.
+QUANT_MODES = ("float16", "int8")
+Quantized = namedtuple("Quantized", "codes scales normalized")
+
+
+def quantize(X, mode="int8", normalize=False, chunk_rows=65536):
+    """
+    Compact copy of X (n x d) as a Quantized(codes, scales, normalized).
+    normalize: scale rows to unit length first, so inner products of the
+    result are cosine similarities. X is read chunk by chunk (memmaps work).
+    """
+    if mode not in QUANT_MODES:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {QUANT_MODES}.")
+    n, d = X.shape
+    codes = np.empty((n, d), dtype=np.int8 if mode == "int8" else np.float16)
+    scales = np.empty(n, dtype=np.float32) if mode == "int8" else None
+    for i0 in range(0, n, chunk_rows):
+        B = np.array(X[i0:i0 + chunk_rows], dtype=np.float32)
+        if normalize:
+            norms = np.linalg.norm(B, axis=1)
+            norms[norms == 0] = 1
+            B /= norms[:, None]
+        if mode == "int8":
+            s = np.abs(B).max(axis=1) / 127
+            s[s == 0] = 1
+            codes[i0:i0 + len(B)] = np.rint(B / s[:, None])
+            scales[i0:i0 + len(B)] = s
+        else:
+            codes[i0:i0 + len(B)] = B
+    return Quantized(codes, scales, normalize)
+
+
+def _quantized_block(q, i0, i1):
+    """float32 codes of rows i0:i1 and their scales (None for float16)."""
+    return q.codes[i0:i1].astype(np.float32), None if q.scales is None else q.scales[i0:i1]
+
+
+def _quantized_tile(A, a_scale, B, b_scale):
+    tile = A @ B.T
+    if a_scale is not None:
+        tile *= a_scale[:, None]
+    if b_scale is not None:
+        tile *= b_scale[None, :]
+    return tile
+
+
+def quantized_inner_products(A, B=None):
+    """
+    Pairwise inner products (cosines when quantized with normalize=True) of
+    two Quantized matrices, B defaulting to A. Returns a float32 (n x m) matrix.
+    """
+    B = A if B is None else B
+    return _quantized_tile(*_quantized_block(A, 0, len(A.codes)), *_quantized_block(B, 0, len(B.codes)))
+
+
+def topk_quantized(queries, corpus, k, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    topk by inner product (cosine if the corpus was quantized with
+    normalize=True) against a Quantized corpus. Plain-array queries are
+    quantized the same way as the corpus.
+    Returns (indices, scores), both (q x k), nearest first.
+    """
+    if not isinstance(queries, Quantized):
+        mode = "int8" if corpus.scales is not None else "float16"
+        queries = quantize(np.atleast_2d(queries), mode, corpus.normalized)
+    q, n, d = len(queries.codes), len(corpus.codes), corpus.codes.shape[1]
+    k = min(k, n)
+    # per cell: the float32 tile and merge candidates; per row / column:
+    # the codes widened to float32 plus a scale, and each query's top-k
+    per_row = 4 * (d + 1)
+    rows, cols = _tile_shape(q, n, 4 + 4 + 8, memory_budget,
+                             per_row + 2 * k * (4 + 8), per_row)
+
+    return _streamed_topk(
+        q, n, k, rows, cols,
+        lambda i0, i1: _quantized_block(queries, i0, i1),
+        lambda j0, j1: _quantized_block(corpus, j0, j1),
+        lambda a, b: _quantized_tile(*a, *b),
+        -1, np.float32)
+
+
+def recall_at_k(found, exact):
+    """
+    Mean fraction of each row of `exact` (q x k true neighbour indices) that
+    also appears in the same row of `found` (q x k' approximate indices).
+    """
+    found, exact = np.asarray(found), np.asarray(exact)
+    hits = (exact[:, :, None] == found[:, None, :]).any(axis=2).sum()
+    return hits / exact.size
 
 
 def pairwise_inner_products(X):
@@ -141,6 +587,146 @@ def pairwise_inner_products(X):
     return X @ X.T
 
 
+# On-disk embeddings. Inputs are memory-mapped and only read one block at
+# a time, results go straight into memory-mapped .npy files, so matrices
+# larger than RAM work end to end.
+# Raw files: a header of two little-endian int64 (n, dim), then n x dim
+# row-major values.
+RAW_HEADER = np.dtype([("n", "<i8"), ("dim", "<i8")])
+
+
+def open_embeddings(path, mode="r", shape=None, dtype=np.float32):
+    """
+    Memory-map an (n x dim) embedding matrix without reading it. `.npy`
+    files carry their own shape and dtype; anything else is raw `dtype`
+    data with the header above, or headerless when `shape` is given.
+    """
+    if str(path).endswith(".npy"):
+        return np.load(path, mmap_mode=mode)
+    if shape is not None:
+        return np.memmap(path, dtype, mode, 0, tuple(shape))
+    header = np.fromfile(path, RAW_HEADER, count=1)
+    if header.size == 0:
+        raise ValueError(f"{path} is too short for a raw embedding header.")
+    shape = (int(header["n"][0]), int(header["dim"][0]))
+    return np.memmap(path, dtype, mode, RAW_HEADER.itemsize, shape)
+
+
+def save_raw_embeddings(path, X, dtype=np.float32, chunk_rows=65536):
+    """Write X (any array or memmap) in the raw format, chunk by chunk."""
+    with open(path, "wb") as f:
+        np.array([(len(X), X.shape[1])], dtype=RAW_HEADER).tofile(f)
+        for i0 in range(0, len(X), chunk_rows):
+            np.asarray(X[i0:i0 + chunk_rows], dtype=dtype).tofile(f)
+
+
+def create_output(path, shape, dtype=np.float32):
+    """A new .npy file of `shape`, memory-mapped for writing."""
+    return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=tuple(shape))
+
+
+def pairwise_to_file(X, out_path, Y=None, metric="l2", dtype=np.float32,
+                     memory_budget=DEFAULT_MEMORY_BUDGET, workers=1):
+    """
+    The (n x m) `metric` matrix of X against Y (or X) written into a new
+    .npy file at out_path; only one tile is ever held in RAM. X / Y may be
+    paths (see open_embeddings) or arrays. workers > 1 uses
+    pairwise_parallel, whose workers write into the file directly.
+    Returns the output memmap.
+    """
+    if metric not in DISTANCE_METRICS + SIMILARITY_METRICS:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of "
+                         f"{DISTANCE_METRICS + SIMILARITY_METRICS}.")
+    X = open_embeddings(X) if isinstance(X, (str, os.PathLike)) else X
+    Y = open_embeddings(Y) if isinstance(Y, (str, os.PathLike)) else Y
+    dtype = np.dtype(dtype)
+    out = create_output(out_path, (len(X), len(X if Y is None else Y)), dtype)
+    if workers > 1:
+        pairwise_parallel(X, Y, metric, workers, dtype, memory_budget, out)
+    else:
+        _pairwise_into(X, Y, metric, dtype, memory_budget, out)
+    out.flush()
+    return out
+
+
+def topk_to_file(queries, corpus, k, out_prefix, metric="cosine", dtype=np.float32,
+                 memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    topk for (memory-mapped) inputs, streamed in query chunks into
+    <out_prefix>_indices.npy (int64) and <out_prefix>_scores.npy, both
+    (q x k). Each chunk reads the corpus once, so chunks are as large as
+    the memory budget allows.
+    Returns the (indices, scores) memmaps.
+    """
+    queries = open_embeddings(queries) if isinstance(queries, (str, os.PathLike)) else queries
+    corpus = open_embeddings(corpus) if isinstance(corpus, (str, os.PathLike)) else corpus
+    dtype = np.dtype(dtype)
+    k = min(k, len(corpus))
+    indices = create_output(f"{out_prefix}_indices.npy", (len(queries), k), np.int64)
+    scores = create_output(f"{out_prefix}_scores.npy", (len(queries), k), dtype)
+
+    # running top-k candidates (up to 2k scores + indices per query) get a
+    # quarter of the budget, topk's own tiles the rest
+    chunk = max(1, memory_budget // (4 * 2 * k * (dtype.itemsize + 8)))
+    for i0 in range(0, len(queries), chunk):
+        I, S = topk(queries[i0:i0 + chunk], corpus, k, metric, dtype, memory_budget * 3 // 4)
+        indices[i0:i0 + len(I)] = I
+        scores[i0:i0 + len(S)] = S
+    indices.flush()
+    scores.flush()
+    return indices, scores
+
+
+# Heatmaps of large matrices. A screen cannot show more cells than the
+# axes has pixels, so blocks of cells are reduced to one value first, one
+# band of rows at a time (memmaps are never read whole). Per-cell text
+# labels are only drawn for small matrices.
+ANNOTATE_MAX_CELLS = 30 * 30
+BLOCK_REDUCTIONS = {"mean": np.add, "max": np.maximum, "min": np.minimum}
+
+
+def aggregate_blocks(matrix, shape, how="mean", memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Shrink matrix (n x m) to at most shape = (rows, cols) cells by reducing
+    each block of ceil(n / rows) x ceil(m / cols) cells with how ("mean",
+    "max" or "min"); edge blocks may be smaller.
+    Returns the float64 aggregate and the block size (block_rows, block_cols).
+    """
+    if how not in BLOCK_REDUCTIONS:
+        raise ValueError(f"Unknown aggregation {how!r}; expected one of {tuple(BLOCK_REDUCTIONS)}.")
+    ufunc = BLOCK_REDUCTIONS[how]
+    n, m = matrix.shape
+    by, bx = -(-n // max(1, shape[0])), -(-m // max(1, shape[1]))
+    row_starts, col_starts = np.arange(0, n, by), np.arange(0, m, bx)
+    out = np.empty((len(row_starts), len(col_starts)))
+    # whole block rows per read, as many as fit the budget in float64
+    band = by * max(1, memory_budget // (8 * m * by))
+    for i0 in range(0, n, band):
+        B = np.asarray(matrix[i0:i0 + band], dtype=np.float64)
+        B = ufunc.reduceat(B, col_starts, axis=1)
+        out[i0 // by:(i0 + len(B) - 1) // by + 1] = ufunc.reduceat(B, np.arange(0, len(B), by), axis=0)
+    if how == "mean":
+        out /= np.diff(np.append(row_starts, n))[:, None] * np.diff(np.append(col_starts, m))[None, :]
+    return out, (by, bx)
+
+
+def heatmap_cells(matrix, ax, aggregate="mean"):
+    """
+    The cells to imshow on ax and their extent (None when drawn 1:1). The
+    matrix is block-aggregated when it has more cells than ax has pixels.
+    """
+    if isinstance(matrix, (str, os.PathLike)):
+        matrix = open_embeddings(matrix)
+    bbox = ax.get_window_extent()
+    screen = (max(1, int(bbox.height)), max(1, int(bbox.width)))
+    n, m = matrix.shape
+    if aggregate is None or (n <= screen[0] and m <= screen[1]):
+        return np.asarray(matrix), None
+    cells, _ = aggregate_blocks(matrix, screen, aggregate)
+    # axes keep showing original vector indices
+    return cells, (-0.5, m - 0.5, n - 0.5, -0.5)
+
+
 def main(n=5, dim=2, seed=42):
     vectors = generate_vectors(n=n, dim=dim, seed=seed)
 
@@ -226,5 +812,48 @@ def main(n=5, dim=2, seed=42):
     plt.show()
 
 
+def cli(argv=None):
+    """
+    No arguments: the small plotted demo (main). Otherwise:
+      pairwise X.npy --out D.npy [--y Y.npy] [--metric l2] [--workers N]
+      topk Q.npy C.npy --k 10 --out results [--metric cosine]
+    Inputs are .npy or raw files (see open_embeddings).
+    """
+    ap = argparse.ArgumentParser(description="Pairwise similarity / distance tools.",
+                                 epilog=cli.__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="command")
+    metrics = DISTANCE_METRICS + SIMILARITY_METRICS
+
+    pw = sub.add_parser("pairwise", help="full matrix into a memory-mapped .npy")
+    pw.add_argument("x")
+    pw.add_argument("--y", help="second matrix (default: X against itself)")
+    pw.add_argument("--out", required=True, help="output .npy path")
+    pw.add_argument("--metric", default="l2", choices=metrics)
+    pw.add_argument("--dtype", default="float32", choices=("float32", "float64"))
+    pw.add_argument("--workers", type=int, default=1)
+    pw.add_argument("--budget-mb", type=int, default=DEFAULT_MEMORY_BUDGET // 2**20)
+
+    tk = sub.add_parser("topk", help="k nearest corpus rows per query")
+    tk.add_argument("queries")
+    tk.add_argument("corpus")
+    tk.add_argument("--k", type=int, default=10)
+    tk.add_argument("--out", required=True, help="output prefix for _indices.npy / _scores.npy")
+    tk.add_argument("--metric", default="cosine", choices=metrics)
+    tk.add_argument("--dtype", default="float32", choices=("float32", "float64"))
+    tk.add_argument("--budget-mb", type=int, default=DEFAULT_MEMORY_BUDGET // 2**20)
+
+    args = ap.parse_args(argv)
+    if args.command is None:
+        main(n=6, dim=2, seed=124)
+    elif args.command == "pairwise":
+        out = pairwise_to_file(args.x, args.out, args.y, args.metric, args.dtype,
+                               args.budget_mb * 2**20, args.workers)
+        print(f"Wrote {out.shape[0]} x {out.shape[1]} {args.metric} matrix to {args.out}")
+    else:
+        I, _ = topk_to_file(args.queries, args.corpus, args.k, args.out, args.metric,
+                            args.dtype, args.budget_mb * 2**20)
+        print(f"Wrote top-{I.shape[1]} of {I.shape[0]} queries to {args.out}_indices.npy / _scores.npy")
+
+
 if __name__ == "__main__":
-    main(n=6, dim=2, seed=124)
+    cli()
@@ -0,0 +1,220 @@
+"""
+IVF-flat approximate nearest-neighbour index in plain NumPy.
+
+Vectors are clustered by k-means into `nlist` inverted lists. A query scans
+only the `nprobe` lists whose centroids are nearest to it, exactly (hence
+"flat"), instead of the whole corpus. nprobe trades recall for speed;
+nprobe = nlist is brute force.
+
+    index = IVFFlatIndex(nlist=1024, metric="cosine").build(vectors)
+    ids, scores = index.search(queries, k=10, nprobe=16)
+    index.save("my_index")            # a directory of .npy files
+    index = IVFFlatIndex.load("my_index", mmap=True)
+"""
+import json
+import os
+
+import numpy as np
+
+from all_similarity_distance_calculations import topk
+
+
+def training_sample(X, n, rng):
+    """At most n distinct rows of X, in file order (kind to memmaps)."""
+    if len(X) <= n:
+        return np.asarray(X)
+    return np.asarray(X[np.sort(rng.choice(len(X), n, replace=False))])
+
+
+def kmeans(X, k, n_iter=10, metric="l2", spherical=False, rng=None):
+    """
+    Lloyd's k-means: (k x d) float32 centroids of the rows of X.
+    Points are assigned with topk() by metric ("l2" or "inner"); spherical
+    re-normalizes the centroids each step (for unit-length data). Empty
+    clusters are re-seeded with random points.
+    """
+    rng = np.random.default_rng(rng)
+    X = np.asarray(X, dtype=np.float32)
+    n = len(X)
+    centroids = X[rng.choice(n, k, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = topk(X, centroids, 1, metric, dtype=np.float32)[0][:, 0]
+        counts = np.bincount(assign, minlength=k)
+        order = np.argsort(assign, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        filled = counts > 0
+        centroids = np.empty_like(centroids)
+        centroids[filled] = np.add.reduceat(X[order], starts[filled]) / counts[filled, None]
+        centroids[~filled] = X[rng.choice(n, int((~filled).sum()), replace=False)]
+        if spherical:
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1), 1e-12)[:, None]
+    return centroids
+
+
+class IVFFlatIndex:
+    METRICS = ("l2", "cosine", "inner")
+
+    def __init__(self, nlist=256, metric="l2", seed=0):
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {self.METRICS}.")
+        self.nlist = nlist
+        self.metric = metric
+        self.seed = seed
+        self.centroids = None
+        # Stored vectors sorted by list: list c is rows offsets[c]:offsets[c + 1]
+        self.vectors = None
+        self.ids = None
+        self.offsets = None
+        self._sq_norms = None   # ||v||^2 per stored row, for l2
+        self._pending = []      # (vectors, ids, lists) added since the last search
+
+    def __len__(self):
+        stored = 0 if self.ids is None else len(self.ids)
+        return stored + sum(len(ids) for _, ids, _ in self._pending)
+
+    # ── building ─────────────────────────────────────────
+    def _prepare(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if self.metric == "cosine":
+            norms = np.linalg.norm(X, axis=1)
+            norms[norms == 0] = 1
+            X = X / norms[:, None]
+        return X
+
+    def _coarse_metric(self):
+        # cosine vectors are unit length, where l2 and cosine rank alike
+        return "inner" if self.metric == "inner" else "l2"
+
+    def _assign(self, X, nprobe=1):
+        idx, _ = topk(X, self.centroids, nprobe, self._coarse_metric(), dtype=np.float32)
+        return idx
+
+    def train(self, X, n_iter=10, max_samples=64):
+        """
+        Fit the centroids with k-means on at most max_samples points per
+        list, drawn from X.
+        """
+        rng = np.random.default_rng(self.seed)
+        if len(X) < self.nlist:
+            raise ValueError(f"Need at least nlist={self.nlist} training vectors, got {len(X)}.")
+        sample = self._prepare(training_sample(X, self.nlist * max_samples, rng))
+        self.centroids = kmeans(sample, self.nlist, n_iter, self._coarse_metric(),
+                                spherical=self.metric == "cosine", rng=rng)
+        return self
+
+    def add(self, X, ids=None):
+        """Add vectors (ids default to 0, 1, ... in insertion order)."""
+        if self.centroids is None:
+            raise RuntimeError("Index is not trained; call train() or build() first.")
+        X = self._prepare(X)
+        if ids is None:
+            ids = np.arange(len(self), len(self) + len(X))
+        lists = self._assign(X)[:, 0]
+        self._pending.append((X, np.asarray(ids, dtype=np.int64), lists))
+        return self
+
+    def build(self, X, ids=None, n_iter=10):
+        return self.train(X, n_iter).add(X, ids)
+
+    def _consolidate(self):
+        """Merge pending additions into the list-sorted arrays."""
+        if not self._pending:
+            return
+        parts_v, parts_i, parts_l = zip(*self._pending)
+        if self.ids is not None and len(self.ids):
+            stored_lists = np.repeat(np.arange(self.nlist), np.diff(self.offsets))
+            parts_v = (np.asarray(self.vectors),) + parts_v
+            parts_i = (np.asarray(self.ids),) + parts_i
+            parts_l = (stored_lists,) + parts_l
+        lists = np.concatenate(parts_l)
+        order = np.argsort(lists, kind="stable")
+        self.vectors = np.concatenate(parts_v)[order]
+        self.ids = np.concatenate(parts_i)[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(lists, minlength=self.nlist))])
+        self._sq_norms = None
+        self._pending = []
+
+    # ── searching ────────────────────────────────────────
+    def search(self, queries, k=10, nprobe=8):
+        """
+        Approximate top-k: (ids, scores), both (q x k), nearest first.
+        Scores are distances for l2 (lower is nearer) and similarities for
+        cosine / inner; slots with no candidate have id -1.
+        Work is grouped by list, so each probed list costs one matrix
+        product against all the queries that probe it.
+        """
+        self._consolidate()
+        Q = np.atleast_2d(self._prepare(queries))
+        nq, nprobe = len(Q), min(nprobe, self.nlist)
+        probes = self._assign(Q, nprobe)                   # (nq, nprobe)
+        if self.metric == "l2" and self._sq_norms is None:
+            self._sq_norms = np.einsum("ij,ij->i", self.vectors, self.vectors)
+
+        # every (query, probe) slot keeps its k best as "lower is better"
+        cand_s = np.full((nq, nprobe, k), np.inf, dtype=np.float32)
+        cand_i = np.full((nq, nprobe, k), -1, dtype=np.int64)
+        flat_q = np.repeat(np.arange(nq), nprobe)
+        flat_slot = np.tile(np.arange(nprobe), nq)
+        flat_list = probes.ravel()
+        order = np.argsort(flat_list, kind="stable")
+        bounds = np.searchsorted(flat_list[order], np.arange(self.nlist + 1))
+        for c in range(self.nlist):
+            lo, hi = self.offsets[c], self.offsets[c + 1]
+            sel = order[bounds[c]:bounds[c + 1]]
+            if hi == lo or len(sel) == 0:
+                continue
+            qs, slots = flat_q[sel], flat_slot[sel]
+            V = self.vectors[lo:hi]
+            if self.metric == "l2":
+                s = -2 * (Q[qs] @ V.T)
+                s += self._sq_norms[lo:hi][None, :]        # + ||q||^2 added at the end
+            else:
+                s = -(Q[qs] @ V.T)
+            kk = min(k, hi - lo)
+            if hi - lo > kk:
+                part = np.argpartition(s, kk - 1, axis=1)[:, :kk]
+            else:
+                part = np.broadcast_to(np.arange(hi - lo), s.shape)
+            cand_s[qs, slots, :kk] = np.take_along_axis(s, part, axis=1)
+            cand_i[qs, slots, :kk] = part + lo
+
+        cand_s = cand_s.reshape(nq, nprobe * k)
+        cand_i = cand_i.reshape(nq, nprobe * k)
+        part = np.argpartition(cand_s, k - 1, axis=1)[:, :k]
+        best_s = np.take_along_axis(cand_s, part, axis=1)
+        best_r = np.take_along_axis(cand_i, part, axis=1)
+        order = np.argsort(best_s, axis=1, kind="stable")
+        best_s = np.take_along_axis(best_s, order, axis=1)
+        best_r = np.take_along_axis(best_r, order, axis=1)
+
+        ids = np.where(best_r >= 0, self.ids[np.maximum(best_r, 0)], -1)
+        if self.metric == "l2":
+            q_sq = np.einsum("ij,ij->i", Q, Q)[:, None]
+            scores = np.sqrt(np.maximum(best_s + q_sq, 0))
+        else:
+            scores = -best_s
+        return ids, scores
+
+    # ── persistence ──────────────────────────────────────
+    def save(self, path):
+        """Write the index as a directory of .npy files plus meta.json."""
+        self._consolidate()
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"nlist": self.nlist, "metric": self.metric, "seed": self.seed}, f)
+        for name in ("centroids", "vectors", "ids", "offsets"):
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """
+        Read an index written by save(). mmap=True maps the stored vectors
+        instead of reading them, so the index can exceed RAM.
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        index = cls(meta["nlist"], meta["metric"], meta["seed"])
+        for name in ("centroids", "vectors", "ids", "offsets"):
+            mode = "r" if mmap and name == "vectors" else None
+            setattr(index, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode))
+        return index
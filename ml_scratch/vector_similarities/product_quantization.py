@@ -0,0 +1,214 @@
+"""
+Product quantization (PQ) in plain NumPy: compressed embeddings searched by
+asymmetric distance computation (ADC).
+
+Each d-dimensional vector is cut into m sub-vectors and each sub-vector is
+replaced by the index of its nearest of ksub (<= 256) sub-centroids, so a
+vector costs m bytes: 1M x 768-d float32 (3 GB) fits in 96 MB at m = 96.
+Queries stay full precision. Per query, one (m x ksub) lookup table of
+sub-distances is computed, and the distance to any code is the sum of m
+table entries.
+
+The ADC ranking is approximate. Passing the full-precision vectors
+(usually a memmap) to search() re-scores a shortlist exactly.
+
+    pq = ProductQuantizer(m=96, metric="cosine").build(vectors)
+    ids, scores = pq.search(queries, k=10)
+    ids, scores = pq.search(queries, k=10, rerank=100,
+                            vectors=open_embeddings("vectors.npy"))
+"""
+import json
+import os
+
+import numpy as np
+
+from all_similarity_distance_calculations import (
+    DEFAULT_MEMORY_BUDGET, _streamed_topk, _tile_shape, open_embeddings,
+)
+from ann_index import kmeans, training_sample
+
+
+class ProductQuantizer:
+    METRICS = ("l2", "cosine", "inner")
+
+    def __init__(self, m=8, ksub=256, metric="l2", seed=0):
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {self.METRICS}.")
+        if not 1 < ksub <= 256:
+            raise ValueError(f"ksub must be in 2..256 to fit uint8 codes, got {ksub}.")
+        self.m = m
+        self.ksub = ksub
+        self.metric = metric
+        self.seed = seed
+        self.codebooks = None   # (m x ksub x d / m)
+        self.codes = None       # (n x m) uint8, one row per added vector
+        self._pending = []      # code blocks added since the last search
+
+    def __len__(self):
+        stored = 0 if self.codes is None else len(self.codes)
+        return stored + sum(len(c) for c in self._pending)
+
+    # ── training / encoding ──────────────────────────────
+    def _prepare(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        if self.metric == "cosine":
+            norms = np.linalg.norm(X, axis=1)
+            norms[norms == 0] = 1
+            X = X / norms[:, None]
+        return X
+
+    def _split(self, X):
+        """(n x d) -> (n x m x d / m) view."""
+        if X.shape[1] % self.m:
+            raise ValueError(f"Vector width {X.shape[1]} is not divisible by m={self.m}.")
+        return X.reshape(len(X), self.m, -1)
+
+    def train(self, X, n_iter=10, max_samples=64):
+        """
+        Fit one k-means codebook per sub-space on at most max_samples points
+        per centroid, drawn from X.
+        """
+        rng = np.random.default_rng(self.seed)
+        if len(X) < self.ksub:
+            raise ValueError(f"Need at least ksub={self.ksub} training vectors, got {len(X)}.")
+        sample = self._split(self._prepare(training_sample(X, self.ksub * max_samples, rng)))
+        self.codebooks = np.stack([kmeans(sample[:, j], self.ksub, n_iter, rng=rng)
+                                   for j in range(self.m)])
+        return self
+
+    def encode(self, X, chunk_rows=65536):
+        """(n x m) uint8 codes of X, read chunk by chunk (memmaps work)."""
+        if self.codebooks is None:
+            raise RuntimeError("Quantizer is not trained; call train() or build() first.")
+        codes = np.empty((len(X), self.m), dtype=np.uint8)
+        cb_sq = np.einsum("mkd,mkd->mk", self.codebooks, self.codebooks)
+        for i0 in range(0, len(X), chunk_rows):
+            S = self._split(self._prepare(X[i0:i0 + chunk_rows]))
+            for j in range(self.m):
+                # nearest sub-centroid: argmin ||c||^2 - 2 s.c
+                d = S[:, j] @ self.codebooks[j].T
+                d *= -2
+                d += cb_sq[j]
+                codes[i0:i0 + len(S), j] = np.argmin(d, axis=1)
+        return codes
+
+    def decode(self, codes):
+        """Approximate (n x d) float32 vectors from their codes."""
+        codes = np.asarray(codes)
+        return self.codebooks[np.arange(self.m), codes].reshape(len(codes), -1)
+
+    def add(self, X, chunk_rows=65536):
+        """Encode and append vectors; they are numbered 0, 1, ... in insertion order."""
+        self._pending.append(self.encode(X, chunk_rows))
+        return self
+
+    def build(self, X, n_iter=10):
+        return self.train(X, n_iter).add(X)
+
+    def _consolidate(self):
+        if not self._pending:
+            return
+        stored = [] if self.codes is None else [np.asarray(self.codes)]
+        self.codes = np.concatenate(stored + self._pending)
+        self._pending = []
+
+    # ── searching ────────────────────────────────────────
+    def lookup_tables(self, queries):
+        """
+        (m x q x ksub) float32 ADC tables: squared l2 distances (l2) or
+        negated inner products (cosine / inner) of every query sub-vector to
+        every sub-centroid, so that lower sums are nearer.
+        """
+        S = self._split(self._prepare(np.atleast_2d(queries)))
+        lut = -np.einsum("qmd,mkd->mqk", S, self.codebooks)
+        if self.metric == "l2":
+            lut *= 2
+            lut += np.einsum("mkd,mkd->mk", self.codebooks, self.codebooks)[:, None, :]
+            lut += np.einsum("qmd,qmd->mq", S, S)[:, :, None]
+        return lut
+
+    @staticmethod
+    def _adc_tile(lut, codes):
+        tile = np.take(lut[0], codes[:, 0], axis=1)
+        for j in range(1, len(lut)):
+            tile += np.take(lut[j], codes[:, j], axis=1)
+        return tile
+
+    def search(self, queries, k=10, rerank=0, vectors=None,
+               memory_budget=DEFAULT_MEMORY_BUDGET):
+        """
+        Approximate top-k by ADC: (indices, scores), both (q x k), nearest
+        first. Scores are distances for l2 (lower is nearer) and
+        similarities for cosine / inner.
+        rerank > 0 with vectors (an array, memmap or path for
+        open_embeddings, rows in insertion order) re-scores the best
+        max(k, rerank) ADC candidates exactly with the full-precision
+        vectors.
+        """
+        self._consolidate()
+        Q = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        q, n = len(Q), len(self.codes)
+        shortlist = min(max(k, rerank) if vectors is not None else k, n)
+        # per cell: the float32 tile, one gathered addend and the merge
+        # candidates; per query row: its float32 lookup table and top-k;
+        # per corpus row: the index cast np.take makes of one code column
+        rows, cols = _tile_shape(q, n, 4 + 4 + 4 + 8, memory_budget,
+                                 4 * self.m * self.ksub + 2 * shortlist * (4 + 8), 8)
+
+        # query blocks are outermost, so only one block's tables are alive;
+        # the uint8 codes are indexed as stored, never widened as a block
+        idx, scores = _streamed_topk(
+            q, n, shortlist, rows, cols,
+            lambda i0, i1: self.lookup_tables(Q[i0:i1]),
+            lambda j0, j1: self.codes[j0:j1],
+            self._adc_tile,
+            1, np.float32)
+
+        if vectors is not None and rerank > 0:
+            if isinstance(vectors, (str, os.PathLike)):
+                vectors = open_embeddings(vectors)
+            return self._rerank(Q, idx, vectors, min(k, n), memory_budget)
+        if self.metric == "l2":
+            return idx, np.sqrt(np.maximum(scores, 0))
+        return idx, -scores
+
+    def _rerank(self, Q, idx, vectors, k, memory_budget):
+        """Exact top-k among each query's candidate rows idx (q x s)."""
+        Q = self._prepare(Q)
+        q, s = idx.shape
+        step = max(1, memory_budget // max(1, 4 * s * Q.shape[1]))
+        exact = np.empty(idx.shape, dtype=np.float32)
+        for i0 in range(0, q, step):
+            cand = idx[i0:i0 + step]
+            # each distinct row is read once, in file order
+            uniq, inv = np.unique(cand, return_inverse=True)
+            V = self._prepare(vectors[uniq])[inv.ravel()].reshape(*cand.shape, -1)
+            Qb = Q[i0:i0 + step, None, :]
+            if self.metric == "l2":
+                exact[i0:i0 + step] = np.linalg.norm(V - Qb, axis=2)
+            else:
+                exact[i0:i0 + step] = -np.einsum("qsd,qsd->qs", V, Qb)
+        order = np.argsort(exact, axis=1, kind="stable")[:, :k]
+        idx, exact = np.take_along_axis(idx, order, axis=1), np.take_along_axis(exact, order, axis=1)
+        return idx, exact if self.metric == "l2" else -exact
+
+    # ── persistence ──────────────────────────────────────
+    def save(self, path):
+        """Write the quantizer and its codes as a directory of .npy files plus meta.json."""
+        self._consolidate()
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"m": self.m, "ksub": self.ksub, "metric": self.metric, "seed": self.seed}, f)
+        np.save(os.path.join(path, "codebooks.npy"), self.codebooks)
+        codes = self.codes if self.codes is not None else np.empty((0, self.m), dtype=np.uint8)
+        np.save(os.path.join(path, "codes.npy"), codes)
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """Read a quantizer written by save(); mmap=True maps the codes instead of reading them."""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        pq = cls(meta["m"], meta["ksub"], meta["metric"], meta["seed"])
+        pq.codebooks = np.load(os.path.join(path, "codebooks.npy"))
+        pq.codes = np.load(os.path.join(path, "codes.npy"), mmap_mode="r" if mmap else None)
+        return pq
@@ -0,0 +1,225 @@
+"""
+Benchmarks for the vector-similarity helpers.
+
+scaling   pairwise_parallel on 1..N worker processes against the serial
+          pairwise_distances; reports wall time, speedup and efficiency.
+          Pin BLAS to one thread (OMP_NUM_THREADS=1) for clean per-core
+          numbers, otherwise each worker's matmul is multi-threaded too.
+quantized float32 / float16 / int8 cosine top-k against the exact float64
+          result: memory per vector, encode and search time, recall@k.
+ann       IVFFlatIndex (ann_index.py) against brute-force topk: build
+          time, then QPS and recall@k for a range of nprobe values.
+          Gaussian vectors have no cluster structure, which is the worst
+          case for IVF; recall on real embeddings is much higher.
+pq        ProductQuantizer (product_quantization.py) against brute-force
+          topk: bytes per vector, build time, QPS and recall@k by ADC
+          alone and after exact re-ranking from a memmapped .npy.
+
+Run: python similarity_benchmark.py scaling --n 8000 --dim 256 --workers 1 2 4 8
+     python similarity_benchmark.py quantized --n 100000 --dim 384 --k 10
+     python similarity_benchmark.py ann --n 1000000 --dim 64 --nprobe 1 8 32
+     python similarity_benchmark.py pq --n 100000 --dim 128 --m 8 16 32 --rerank 0 100
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from ann_index import IVFFlatIndex
+from all_similarity_distance_calculations import (
+    DISTANCE_METRICS, QUANT_MODES, SIMILARITY_METRICS, generate_vectors, open_embeddings,
+    pairwise_distances, pairwise_parallel, quantize, recall_at_k, topk, topk_quantized,
+)
+from product_quantization import ProductQuantizer
+
+
+def best_of(fn, repeat):
+    """Fastest of `repeat` runs of fn(), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_scaling(n, dim, metric, dtype, workers_list, repeat=3, seed=0):
+    X = generate_vectors(n, dim, seed=seed).astype(dtype)
+    out = np.empty((n, n), dtype=dtype)
+    rows = []
+    if metric in DISTANCE_METRICS:
+        t = best_of(lambda: pairwise_distances(X, metric=metric, dtype=dtype, out=out), repeat)
+        rows.append(("serial", t))
+    for w in workers_list:
+        t = best_of(lambda: pairwise_parallel(X, metric=metric, workers=w, dtype=dtype, out=out), repeat)
+        rows.append((w, t))
+    return rows
+
+
+def print_scaling(rows, n, dim, metric, dtype):
+    print(f"pairwise {metric}, n={n}, dim={dim}, {np.dtype(dtype).name}, {os.cpu_count()} cores")
+    base = next(t for w, t in rows if w == 1) if any(w == 1 for w, _ in rows) else rows[0][1]
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'effic.':>7}")
+    for w, t in rows:
+        if w == "serial":
+            print(f"{w:>8} {t:9.3f}")
+        else:
+            print(f"{w:>8} {t:9.3f} {base / t:7.2f}x {base / t / w:6.0%}")
+
+
+def bench_quantized(n, dim, n_queries, k, seed=0):
+    corpus = generate_vectors(n, dim, seed=seed)
+    queries = generate_vectors(n_queries, dim, seed=seed + 1)
+
+    t0 = time.perf_counter()
+    exact, _ = topk(queries, corpus, k, "cosine", dtype=np.float64)
+    rows = [("float64", corpus.itemsize * dim, 0.0, time.perf_counter() - t0, 1.0)]
+
+    t0 = time.perf_counter()
+    found, _ = topk(queries, corpus, k, "cosine", dtype=np.float32)
+    rows.append(("float32", 4 * dim, 0.0, time.perf_counter() - t0, recall_at_k(found, exact)))
+
+    for mode in QUANT_MODES:
+        t0 = time.perf_counter()
+        q = quantize(corpus, mode, normalize=True)
+        t_enc = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        found, _ = topk_quantized(queries, q, k)
+        t_search = time.perf_counter() - t0
+        per_vec = q.codes.itemsize * dim + (q.scales.itemsize if q.scales is not None else 0)
+        rows.append((mode, per_vec, t_enc, t_search, recall_at_k(found, exact)))
+    return rows
+
+
+def print_quantized(rows, n, dim, n_queries, k):
+    print(f"cosine top-{k}: {n_queries} queries x {n} vectors, dim={dim}")
+    print(f"{'mode':>8} {'B/vec':>7} {'corpus MB':>10} {'encode s':>9} {'search s':>9} {'QPS':>9} "
+          f"{'recall@' + str(k):>9}")
+    for mode, per_vec, t_enc, t_search, recall in rows:
+        print(f"{mode:>8} {per_vec:7d} {per_vec * n / 2**20:10.1f} {t_enc:9.3f} {t_search:9.3f} "
+              f"{n_queries / t_search:9.0f} {recall:9.4f}")
+
+
+def bench_ann(n, dim, n_queries, k, nlist, nprobes, metric="l2", seed=0):
+    corpus = generate_vectors(n, dim, seed=seed).astype(np.float32)
+    queries = generate_vectors(n_queries, dim, seed=seed + 1).astype(np.float32)
+
+    t0 = time.perf_counter()
+    exact, _ = topk(queries, corpus, k, metric, dtype=np.float32)
+    rows = [("brute force", None, time.perf_counter() - t0, 1.0)]
+
+    t0 = time.perf_counter()
+    index = IVFFlatIndex(nlist, metric, seed=seed).build(corpus)
+    t_build = time.perf_counter() - t0
+    for nprobe in nprobes:
+        t0 = time.perf_counter()
+        found, _ = index.search(queries, k, nprobe)
+        rows.append((f"ivf nprobe={nprobe}", nprobe, time.perf_counter() - t0,
+                     recall_at_k(found, exact)))
+    return rows, t_build
+
+
+def print_ann(rows, t_build, n, dim, n_queries, k, nlist, metric):
+    print(f"{metric} top-{k}: {n_queries} queries x {n} vectors, dim={dim}, "
+          f"nlist={nlist} (build {t_build:.1f}s)")
+    print(f"{'method':>16} {'search s':>9} {'QPS':>9} {'recall@' + str(k):>9}")
+    for name, _, t, recall in rows:
+        print(f"{name:>16} {t:9.3f} {n_queries / t:9.0f} {recall:9.4f}")
+
+
+def bench_pq(n, dim, n_queries, k, ms, reranks, metric="l2", seed=0):
+    corpus = generate_vectors(n, dim, seed=seed).astype(np.float32)
+    queries = generate_vectors(n_queries, dim, seed=seed + 1).astype(np.float32)
+
+    t0 = time.perf_counter()
+    exact, _ = topk(queries, corpus, k, metric, dtype=np.float32)
+    rows = [("brute force", 4 * dim, None, time.perf_counter() - t0, 1.0)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.npy")
+        np.save(path, corpus)
+        vectors = open_embeddings(path)
+        for m in ms:
+            t0 = time.perf_counter()
+            pq = ProductQuantizer(m, metric=metric, seed=seed).build(corpus)
+            t_build = time.perf_counter() - t0
+            for rerank in reranks:
+                t0 = time.perf_counter()
+                found, _ = pq.search(queries, k, rerank, vectors)
+                name = f"pq m={m}" + (f" rerank={rerank}" if rerank else "")
+                rows.append((name, m, t_build, time.perf_counter() - t0,
+                             recall_at_k(found, exact)))
+        del vectors
+    return rows
+
+
+def print_pq(rows, n, dim, n_queries, k, metric):
+    print(f"{metric} top-{k}: {n_queries} queries x {n} vectors, dim={dim}")
+    print(f"{'method':>20} {'B/vec':>6} {'MB':>8} {'build s':>8} {'search s':>9} {'QPS':>8} "
+          f"{'recall@' + str(k):>9}")
+    for name, per_vec, t_build, t, recall in rows:
+        build = "" if t_build is None else f"{t_build:.1f}"
+        print(f"{name:>20} {per_vec:6d} {per_vec * n / 2**20:8.1f} {build:>8} {t:9.3f} "
+              f"{n_queries / t:8.0f} {recall:9.4f}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    sub = ap.add_subparsers(dest="bench", required=True)
+
+    sc = sub.add_parser("scaling", help="multi-core pairwise scaling")
+    sc.add_argument("--n", type=int, default=4000)
+    sc.add_argument("--dim", type=int, default=256)
+    sc.add_argument("--metric", default="l2", choices=DISTANCE_METRICS + SIMILARITY_METRICS)
+    sc.add_argument("--dtype", default="float32", choices=("float32", "float64"))
+    sc.add_argument("--workers", type=int, nargs="+",
+                    default=[w for w in (1, 2, 4, 8, 16, 32, 64) if w <= (os.cpu_count() or 1)])
+    sc.add_argument("--repeat", type=int, default=3)
+
+    qz = sub.add_parser("quantized", help="float16 / int8 recall@k and speed")
+    qz.add_argument("--n", type=int, default=100000)
+    qz.add_argument("--dim", type=int, default=384)
+    qz.add_argument("--queries", type=int, default=1000)
+    qz.add_argument("--k", type=int, default=10)
+
+    an = sub.add_parser("ann", help="IVF index recall@k / QPS vs brute force")
+    an.add_argument("--n", type=int, default=100000)
+    an.add_argument("--dim", type=int, default=64)
+    an.add_argument("--queries", type=int, default=1000)
+    an.add_argument("--k", type=int, default=10)
+    an.add_argument("--nlist", type=int, default=None, help="default: 4 * sqrt(n)")
+    an.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    an.add_argument("--metric", default="l2", choices=IVFFlatIndex.METRICS)
+
+    pq = sub.add_parser("pq", help="product quantization recall@k / QPS vs brute force")
+    pq.add_argument("--n", type=int, default=100000)
+    pq.add_argument("--dim", type=int, default=128)
+    pq.add_argument("--queries", type=int, default=200)
+    pq.add_argument("--k", type=int, default=10)
+    pq.add_argument("--m", type=int, nargs="+", default=[8, 16, 32],
+                    help="sub-quantizers (bytes per vector); must divide dim")
+    pq.add_argument("--rerank", type=int, nargs="+", default=[0, 100],
+                    help="exact re-ranking shortlist sizes (0 = ADC only)")
+    pq.add_argument("--metric", default="l2", choices=ProductQuantizer.METRICS)
+
+    args = ap.parse_args(argv)
+    if args.bench == "scaling":
+        rows = bench_scaling(args.n, args.dim, args.metric, args.dtype, args.workers, args.repeat)
+        print_scaling(rows, args.n, args.dim, args.metric, args.dtype)
+    elif args.bench == "quantized":
+        rows = bench_quantized(args.n, args.dim, args.queries, args.k)
+        print_quantized(rows, args.n, args.dim, args.queries, args.k)
+    elif args.bench == "ann":
+        nlist = args.nlist or int(4 * args.n ** 0.5)
+        rows, t_build = bench_ann(args.n, args.dim, args.queries, args.k, nlist, args.nprobe,
+                                  args.metric)
+        print_ann(rows, t_build, args.n, args.dim, args.queries, args.k, nlist, args.metric)
+    elif args.bench == "pq":
+        rows = bench_pq(args.n, args.dim, args.queries, args.k, args.m, args.rerank, args.metric)
+        print_pq(rows, args.n, args.dim, args.queries, args.k, args.metric)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from all_similarity_distance_calculations import (
+    open_embeddings, pairwise_distances, pairwise_to_file, quantize, topk, topk_quantized,
+    topk_to_file,
+)
+from product_quantization import ProductQuantizer
+
+MB = 2**20
+
+
+def peak_bytes(fn):
+    """Peak traced allocation (bytes) while fn() runs, and its result."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+class MemoryBudgetTestCase(unittest.TestCase):
+    """A memmapped corpus much larger than the budget is streamed, not copied."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        corpus = rng.normal(size=(40000, 256)).astype(np.float32)   # ~39 MB
+        cls.path = os.path.join(cls.tmp.name, "corpus.npy")
+        np.save(cls.path, corpus)
+        cls.queries = corpus[:4] + 0.5
+        cls.budget = 4 * MB
+        del corpus
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def assertWithinBudget(self, peak, result_bytes=0):
+        # the budget, the result itself and a little interpreter slack
+        self.assertLess(peak, self.budget + result_bytes + MB)
+
+    def test_pairwise_distances_memmap(self):
+        Y = open_embeddings(self.path)
+        for metric in ("l2", "l1"):
+            peak, D = peak_bytes(lambda: pairwise_distances(
+                self.queries, Y, metric, memory_budget=self.budget))
+            self.assertWithinBudget(peak, D.nbytes)
+            expected = pairwise_distances(self.queries, np.asarray(Y[:100]), metric)
+            np.testing.assert_allclose(D[:, :100], expected, rtol=1e-6)
+
+    def test_topk_memmap(self):
+        corpus = open_embeddings(self.path)
+        for metric in ("cosine", "l2"):
+            peak, (I, S) = peak_bytes(lambda: topk(
+                self.queries, corpus, 10, metric, np.float64, memory_budget=self.budget))
+            self.assertWithinBudget(peak, I.nbytes + S.nbytes)
+            expected, _ = topk(self.queries, np.asarray(corpus), 10, metric, np.float64)
+            np.testing.assert_array_equal(I, expected)
+
+    def test_files_cosine(self):
+        out = os.path.join(self.tmp.name, "out")
+        peak, (I, _) = peak_bytes(lambda: topk_to_file(
+            self.queries, self.path, 10, out, "cosine", memory_budget=self.budget))
+        self.assertWithinBudget(peak)
+        expected, _ = topk(self.queries, open_embeddings(self.path), 10, "cosine")
+        np.testing.assert_array_equal(I, expected)
+
+        peak, D = peak_bytes(lambda: pairwise_to_file(
+            self.queries, out + "_pairwise.npy", self.path, "cosine", memory_budget=self.budget))
+        self.assertWithinBudget(peak)
+        self.assertEqual(D.shape, (len(self.queries), 40000))
+
+    def test_topk_quantized(self):
+        codes = quantize(open_embeddings(self.path), "int8", normalize=True)   # ~10 MB
+        peak, (I, _) = peak_bytes(lambda: topk_quantized(
+            self.queries, codes, 10, memory_budget=self.budget))
+        self.assertWithinBudget(peak)
+        expected, _ = topk_quantized(self.queries, codes, 10)
+        np.testing.assert_array_equal(I, expected)
+
+    def test_pq_search(self):
+        rng = np.random.default_rng(1)
+        pq = ProductQuantizer(m=32)
+        pq.codebooks = rng.normal(size=(32, 256, 8)).astype(np.float32)
+        pq.codes = rng.integers(0, 256, size=(400000, 32), dtype=np.uint8)   # ~12 MB
+        queries = rng.normal(size=(4, 256)).astype(np.float32)
+        peak, (I, _) = peak_bytes(lambda: pq.search(queries, 10, memory_budget=self.budget))
+        self.assertWithinBudget(peak)
+        expected, _ = pq.search(queries, 10)
+        np.testing.assert_array_equal(I, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()